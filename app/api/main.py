@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Depends, HTTPException, Query, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from app.api.schemas import (
     SearchJobRequest, SearchJobResponse, CrawlJobRequest, CrawlJobResponse,
     LeadFilter, PaginatedLeadsResponse, LeadResponse, ErrorResponse
@@ -10,38 +10,89 @@ from datetime import datetime
 import logging
 import csv
 import pandas as pd
-import json as pyjson
 import os
+import time
+import asyncio
+import anyio
+import threading
+import concurrent.futures
+import multiprocessing
+import httpx
+from lxml import etree
 from contextlib import asynccontextmanager
 
+try:
+    # libuv-backed loop; uvicorn's default --loop auto already picks it up for the server
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 # Import core pipeline modules
-from app.core.search_orchestrator import SearchOrchestrator
+from app.core.search_client import GoogleSearchClient
 from app.core.crawl_manager import CrawlManager
 from app.core.http_crawler import SimpleHttpCrawler
+from app.core.text_cleaner import parse_html_document
+from app.core.playwright_crawler import playwright_pool
 from app.core.lead_extractor import extract_pattern_leads, extract_structured_leads, ai_extract_leads
-from app.core.lead_scorer import score_lead
+from app.core.lead_scorer import score_lead, score_leads_batch
 from app.core.background_tasks import JobQueue, BaseWorker, Job
 from app.core.file_manager import save_extracted_data, EXPORTS_DIR, timestamped_filename
 from app.core.monitoring import JsonLogger, get_system_metrics, PerformanceTracker
-from app.core.lead_storage import lead_storage  # Add this import
+from app.core.lead_storage import lead_storage, LeadColumnStore  # Add this import
 
 integration_debug_logger = logging.getLogger("integration_debug")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup code
-    global workers
+    global workers, BG_LOOP, EXTRACTION_POOL
+    # Raise the threadpool cap for the sync paths that still go through anyio (to_thread, sync deps)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 200
+    # One long-lived event loop for all job handlers, so client pools survive across jobs
+    BG_LOOP = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    threading.Thread(target=BG_LOOP.run_forever, name="bg-loop", daemon=True).start()
+    # spawn rather than fork since this process already runs BG_LOOP and the job threads
+    EXTRACTION_POOL = concurrent.futures.ProcessPoolExecutor(
+        max_workers=os.cpu_count() or 2, mp_context=multiprocessing.get_context("spawn")
+    )
+    # Shared keep-alive pool for crawl jobs (only ever used from BG_LOOP)
+    app.state.http = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300),
+        timeout=httpx.Timeout(10.0),
+        follow_redirects=True,
+    )
+    # Shared Google search client, likewise pinned to BG_LOOP
+    app.state.search_client = GoogleSearchClient()
     integration_debug_logger.info("[lifespan] Starting background workers for job types: search, crawl, lead_processing")
+    # Workers signal job completion back onto the server loop (see search_and_crawl)
+    server_loop = asyncio.get_running_loop()
     workers = [
-        BaseWorker(job_queue, search_job_handler, 'search', job_timeout=30.0),
-        BaseWorker(job_queue, crawl_job_handler, 'crawl', job_timeout=25.0),
-        BaseWorker(job_queue, lead_processing_handler, 'lead_processing', job_timeout=20.0)
+        BaseWorker(job_queue, search_job_handler, 'search', job_timeout=30.0, loop=server_loop),
+        BaseWorker(job_queue, crawl_job_handler, 'crawl', job_timeout=25.0, loop=server_loop),
+        BaseWorker(job_queue, lead_processing_handler, 'lead_processing', job_timeout=20.0, loop=server_loop)
     ]
     for w in workers:
         integration_debug_logger.info(f"[lifespan] Starting worker: {w.handler.__name__} for job_type: {w.job_type}")
         w.start()
-    yield
-    # (Optional) Shutdown code here
+    try:
+        yield
+    finally:
+        # Shutdown code
+        try:
+            run_on_bg_loop(app.state.http.aclose(), timeout=5)
+        except Exception as e:
+            integration_debug_logger.error(f"[lifespan] Failed to close shared HTTP client: {e}")
+        try:
+            run_on_bg_loop(app.state.search_client.close(), timeout=5)
+        except Exception as e:
+            integration_debug_logger.error(f"[lifespan] Failed to close search client: {e}")
+        try:
+            # No-op unless a crawl launched the shared browser
+            run_on_bg_loop(playwright_pool.stop(), timeout=10)
+        except Exception as e:
+            integration_debug_logger.error(f"[lifespan] Failed to stop Playwright browser: {e}")
+        BG_LOOP.call_soon_threadsafe(BG_LOOP.stop)
+        EXTRACTION_POOL.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(title="Travel Lead Generation API", lifespan=lifespan)
 
@@ -49,6 +100,10 @@ app = FastAPI(title="Travel Lead Generation API", lifespan=lifespan)
 logger = JsonLogger("leadgen", os.path.join("data", "logs", "app.log"))
 perf_tracker = PerformanceTracker()
 
+def _emit(event: str, **kwargs):
+    """Single sink for handler lifecycle events (structured JSON log)"""
+    logger.log("info", event, **kwargs)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -62,34 +117,67 @@ app.add_middleware(
 logging.basicConfig(level=logging.INFO)
 
 # In-memory stores for demo (replace with DB in production)
-search_orchestrator = SearchOrchestrator()
 crawl_manager = CrawlManager()
-leads_store = []  # List[dict]
+leads_store = LeadColumnStore()
+
+# Single-slot response caches keyed on leads_store.version. Every lead write in this
+# app bumps the version once its DB write has returned, so the version also tracks the
+# DB; the TTL bounds staleness from writers outside this process.
+RESPONSE_CACHE_TTL = 5.0
+_response_cache = {}  # name -> (version, expires_at, payload)
+
+async def cached_response(name: str, build):
+    version = leads_store.version
+    now = time.monotonic()
+    hit = _response_cache.get(name)
+    if hit and hit[0] == version and hit[1] > now:
+        return hit[2]
+    payload = await build()
+    _response_cache[name] = (version, now + RESPONSE_CACHE_TTL, payload)
+    return payload
 
 # Background job system
 job_queue = JobQueue()
 workers = []
+BG_LOOP: Optional[asyncio.AbstractEventLoop] = None
+# Process pool for the CPU-bound lead extractors (pattern, structured), created and shut down
+# in lifespan. Regex and lxml work holds the GIL, so worker processes let jobs extract on every
+# core instead of taking turns. The AI extractor is async and runs on BG_LOOP instead.
+EXTRACTION_POOL: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+def run_on_bg_loop(coro, timeout: float):
+    """Run a coroutine on the shared background loop and block until it finishes."""
+    future = asyncio.run_coroutine_threadsafe(coro, BG_LOOP)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise asyncio.TimeoutError
+
+def html_to_text(html_content: str) -> str:
+    """Visible text of a page, space-separated (libxml2 parse instead of bs4's html.parser)."""
+    if not html_content or not html_content.strip():
+        return ''
+    try:
+        root = parse_html_document(html_content)
+    except (etree.ParserError, ValueError):
+        return ''
+    etree.strip_elements(root, 'script', 'style', etree.Comment, with_tail=False)
+    return ' '.join(t.strip() for t in root.itertext() if t.strip())
 
 # Realistic handlers for jobs
-import asyncio
-
 def search_job_handler(job: Job):
-    integration_debug_logger.info(f"[search_job_handler] job_type={job.type}, payload={{'query': job.payload.get('query'), 'priority': job.payload.get('priority', 0), 'max_results': job.payload.get('max_results', 30), 'intent': job.payload.get('intent'), 'location': job.payload.get('location')}}")
-    logger.log("info", "search_job_handler_start", job_type=job.type, payload={"query": job.payload.get('query'), "priority": job.payload.get('priority', 0), "max_results": job.payload.get('max_results', 30), "intent": job.payload.get('intent'), "location": job.payload.get('location')})
-    query = job.payload.get('query')
-    priority = job.payload.get('priority', 0)
-    max_results = job.payload.get('max_results', 30)
-    intent = job.payload.get('intent')
-    location = job.payload.get('location')
+    payload = job.payload_dict
+    query = payload.get('query')
+    priority = payload.get('priority', 0)
+    max_results = payload.get('max_results', 30)
+    intent = payload.get('intent')
+    location = payload.get('location')
+    _emit("search_job_handler_start", job_type=job.type, payload={"query": query, "priority": priority, "max_results": max_results, "intent": intent, "location": location})
 
     try:
-        # Create a new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        from app.core.search_client import GoogleSearchClient
         from app.core.search_result_processor import process_search_results
-        client = GoogleSearchClient()
+        client = app.state.search_client
         
         async def do_search():
             search_query = query
@@ -98,7 +186,7 @@ def search_job_handler(job: Job):
             return processed, raw_results
         
         try:
-            processed_results, raw_results = loop.run_until_complete(asyncio.wait_for(do_search(), timeout=20))
+            processed_results, raw_results = run_on_bg_loop(do_search(), timeout=20)
         except asyncio.TimeoutError:
             error_msg = f"Timeout during search for query: {query}"
             logger.log("error", "search_job_handler_timeout", query=query, error=error_msg)
@@ -109,12 +197,10 @@ def search_job_handler(job: Job):
             logger.log("error", "search_job_handler_failed", query=query, error=error_msg)
             job.error = error_msg
             return {"search_results": [], "raw_results": [], "error": error_msg}
-        finally:
-            loop.close()
         
         # integration_debug_logger.info(f"[search_job_handler] Processed search results: {processed_results}")  # REMOVE VERBOSE
         # integration_debug_logger.info(f"[search_job_handler] Raw Google search results: {raw_results}")  # REMOVE VERBOSE
-        logger.log("info", "search_job_handler_end", processed_results_count=len(processed_results), raw_results_count=len(raw_results))
+        _emit("search_job_handler_end", processed_results_count=len(processed_results), raw_results_count=len(raw_results))
         return {"search_results": processed_results, "raw_results": raw_results}
         
     except Exception as e:
@@ -123,23 +209,36 @@ def search_job_handler(job: Job):
         job.error = error_msg
         return {"search_results": [], "raw_results": [], "error": error_msg}
 
+# Deadline for each URL of a crawl job; URLs are fetched concurrently, so the batch gets
+# this plus some headroom rather than a share of it
+CRAWL_URL_TIMEOUT = 15
+CRAWL_BATCH_TIMEOUT = CRAWL_URL_TIMEOUT + 5
+
 def crawl_job_handler(job: Job):
-    integration_debug_logger.info(f"[crawl_job_handler] job_type={job.type}, payload={job.payload}")
-    logger.log("info", "crawl_job_handler_start", job_type=job.type)
-    url = job.payload.get('url')
-    url = str(url)
+    _emit("crawl_job_handler_start", job_type=job.type)
+    payload = job.payload_dict
+    # Batch jobs carry 'urls'; single-URL jobs from /crawl carry 'url'
+    urls = [str(u) for u in (payload.get('urls') or [payload.get('url')])]
+    url = ", ".join(urls)
     
     try:
-        # Create a new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         # Set a shorter timeout for crawling
-        crawler = SimpleHttpCrawler(timeout=10)  # Reduced timeout to 10 seconds
+        crawler = SimpleHttpCrawler(client=app.state.http, timeout=10)  # Reduced timeout to 10 seconds
+        
+        async def do_crawl():
+            # Fetch every URL concurrently, each under its own deadline; one failed or slow
+            # URL must not sink the batch
+            batches = await asyncio.gather(
+                *(asyncio.wait_for(crawler.crawl([u]), CRAWL_URL_TIMEOUT) for u in urls), return_exceptions=True
+            )
+            for u, batch in zip(urls, batches):
+                if isinstance(batch, asyncio.TimeoutError):
+                    logger.log("error", "crawl_job_handler_url_timeout", url=u, error=f"Timeout crawling URL: {u}")
+            return [r for batch in batches if not isinstance(batch, BaseException) for r in batch]
         
         # Run the crawl operation with timeout
         try:
-            results = loop.run_until_complete(asyncio.wait_for(crawler.crawl([url]), timeout=15))
+            results = run_on_bg_loop(do_crawl(), timeout=CRAWL_BATCH_TIMEOUT)
         except asyncio.TimeoutError:
             error_msg = f"Timeout crawling URL: {url}"
             logger.log("error", "crawl_job_handler_timeout", url=url, error=error_msg)
@@ -150,8 +249,6 @@ def crawl_job_handler(job: Job):
             logger.log("error", "crawl_job_handler_crawl_failed", url=url, error=error_msg)
             job.error = error_msg
             return {"crawl_results": [], "error": error_msg}
-        finally:
-            loop.close()
         
         if not results:
             error_msg = f"Failed to crawl URL: {url}"
@@ -159,24 +256,22 @@ def crawl_job_handler(job: Job):
             job.error = error_msg
             return {"crawl_results": [], "error": error_msg}
         
-        # Extract text from HTML for lead processing
-        from bs4 import BeautifulSoup
-        html_content = results[0].get('html', '') if results else ''
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text_content = soup.get_text(separator=' ', strip=True)
-        
-        # Automatically trigger lead processing with the crawled content
-        lead_job = Job('lead_processing', {
-            'text': text_content,
-            'html': html_content,
-            'source_url': url
-        })
-        job_queue.add_job(lead_job)
-        integration_debug_logger.info(f"[crawl_job_handler] Triggered lead processing job {lead_job.id} for URL {url}")
-        logger.log("info", "crawl_job_handler_triggered_lead_processing", url=url, lead_job_id=lead_job.id)
+        for result in results:
+            # Extract text from HTML for lead processing
+            html_content = result.get('html', '')
+            text_content = html_to_text(html_content)
+            
+            # Automatically trigger lead processing with the crawled content
+            lead_job = Job('lead_processing', {
+                'text': text_content,
+                'html': html_content,
+                'source_url': result['url']
+            })
+            job_queue.add_job(lead_job)
+            _emit("crawl_job_handler_triggered_lead_processing", url=result['url'], lead_job_id=lead_job.id)
         
         # Simplified logging for crawl_job_handler_end
-        logger.log("info", "crawl_job_handler_end", url=url)
+        _emit("crawl_job_handler_end", url=url)
         return {"crawl_results": results}
         
     except Exception as e:
@@ -186,37 +281,40 @@ def crawl_job_handler(job: Job):
         return {"crawl_results": [], "error": error_msg}
 
 def lead_processing_handler(job: Job):
-    integration_debug_logger.info(f"[lead_processing_handler] job_type={job.type}, payload={job.payload}")
-    logger.log("info", "lead_processing_handler_start:", job_type=job.type)
-    text = job.payload.get('text', '')
-    html = job.payload.get('html', '')
-    source_url = job.payload.get('source_url', 'unknown')
-    
-    # Log content lengths for debugging
-    text_length = len(text) if text else 0
-    html_length = len(html) if html else 0
-    integration_debug_logger.info(f"[lead_processing_handler] Processing content from {source_url}: text_length={text_length}, html_length={html_length}")
+    payload = job.payload_dict
+    text = payload.get('text', '')
+    html = payload.get('html', '')
+    source_url = payload.get('source_url', 'unknown')
+    _emit("lead_processing_handler_start", job_type=job.type, source_url=source_url,
+          text_length=len(text) if text else 0, html_length=len(html) if html else 0)
     
     try:
-        # Extract leads using all methods with timeout protection
-        import concurrent.futures
-        
-        # Pattern extraction (fast, no timeout needed)
-        pattern_leads = extract_pattern_leads(text)
-        
-        # Structured extraction (fast, no timeout needed)
-        structured_leads = extract_structured_leads(html)
-        
+        # Run all three extractors side by side: pattern/structured are CPU work on
+        # text vs html and overlap with the AI call's network wait
+        f_pattern = EXTRACTION_POOL.submit(extract_pattern_leads, text)
+        f_structured = EXTRACTION_POOL.submit(extract_structured_leads, html)
+        f_ai = asyncio.run_coroutine_threadsafe(ai_extract_leads(text, html), BG_LOOP)
+        # No deadline of our own on the pool results: a backed-up pool or a worker still
+        # importing the extractors would otherwise turn the page's leads into nothing
+        try:
+            pattern_leads = f_pattern.result()
+        except Exception as e:
+            integration_debug_logger.error(f"[lead_processing_handler] Pattern extraction failed for {source_url}: {e}")
+            pattern_leads = {}
+
+        try:
+            structured_leads = f_structured.result()
+        except Exception as e:
+            integration_debug_logger.error(f"[lead_processing_handler] Structured extraction failed for {source_url}: {e}")
+            structured_leads = {"structured_leads": []}
+
         # AI extraction with timeout
-        ai_leads = {"ai_leads": [], "confidence": 0.0, "explanation": "AI extraction skipped due to timeout"}
         try:
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(ai_extract_leads, text, html)
-                try:
-                    ai_leads = future.result(timeout=20)  # 20 second timeout for AI extraction
-                except concurrent.futures.TimeoutError:
-                    integration_debug_logger.warning(f"[lead_processing_handler] AI extraction timed out for {source_url}")
-                    ai_leads = {"ai_leads": [], "confidence": 0.0, "explanation": "AI extraction timed out"}
+            ai_leads = f_ai.result(timeout=20)  # 20 second timeout for AI extraction
+        except concurrent.futures.TimeoutError:
+            f_ai.cancel()
+            integration_debug_logger.warning(f"[lead_processing_handler] AI extraction timed out for {source_url}")
+            ai_leads = {"ai_leads": [], "confidence": 0.0, "explanation": "AI extraction timed out"}
         except Exception as e:
             integration_debug_logger.error(f"[lead_processing_handler] AI extraction failed for {source_url}: {e}")
             ai_leads = {"ai_leads": [], "confidence": 0.0, "explanation": f"AI extraction failed: {e}"}
@@ -268,19 +366,23 @@ def lead_processing_handler(job: Job):
                 'source_url': source_url
             })
         
-        # Score and store pattern leads
-        for lead in pattern_lead_objects:
+        # Score pattern leads; everything is written to the database in one batch below
+        to_store = []
+        try:
+            batch_scores = score_leads_batch(pattern_lead_objects)
+        except Exception as e:
+            # One malformed lead fails the whole batch; fall back to scoring each lead on its own
+            integration_debug_logger.error(f"[lead_processing_handler] Batch scoring failed, scoring leads individually: {e}")
+            batch_scores = None
+        for i, lead in enumerate(pattern_lead_objects):
             try:
-                lead['scoring'] = score_lead(lead)
-                leads_store.append(lead)
-                # Store in database
-                lead_storage.store_lead_in_db(lead)
+                lead['scoring'] = batch_scores[i] if batch_scores is not None else score_lead(lead)
             except Exception as e:
                 integration_debug_logger.error(f"[lead_processing_handler] Failed to score pattern lead: {e}")
                 lead['scoring'] = {"completeness_score": 0.0, "relevance_score": 0.0, "freshness_score": 0.0, "final_score": 0.0}
-                leads_store.append(lead)
-                # Store in database even if scoring failed
-                lead_storage.store_lead_in_db(lead)
+            leads_store.append(lead)
+            # Store in database even if scoring failed
+            to_store.append(lead)
         
         # Score all AI leads and store them
         scored = []
@@ -303,8 +405,7 @@ def lead_processing_handler(job: Job):
                     lead['scoring'] = score_lead(lead)
                     lead['source_url'] = source_url  # Add source URL to track origin
                     leads_store.append(lead)
-                    # Store in database
-                    lead_storage.store_lead_in_db(lead)
+                    to_store.append(lead)
                     scored.append(lead)
                 else:
                     integration_debug_logger.warning(f"[lead_processing_handler] Skipping invalid lead format: {lead}")
@@ -312,13 +413,21 @@ def lead_processing_handler(job: Job):
                 integration_debug_logger.error(f"[lead_processing_handler] Failed to process AI lead: {e}")
                 continue
         
+        # One transaction for all of this page's leads
+        stored_ids = lead_storage.bulk_store_leads_in_db(to_store)
+        if to_store and not stored_ids:
+            error_msg = f"Failed to store {len(to_store)} leads in database for {source_url}"
+            logger.log("error", "lead_processing_handler_db_error", source_url=source_url, error=error_msg)
+            job.error = error_msg
+        # One bump per batch, after the commit, so no cache is built from pre-commit rows
+        leads_store.bump_version()
+        
         # Log detailed results for debugging
         total_pattern_leads = len(pattern_lead_objects)
         total_ai_leads = len(scored)
         total_leads = total_pattern_leads + total_ai_leads
-        integration_debug_logger.info(f"[lead_processing_handler] Extracted {total_leads} total leads from {source_url} (pattern: {total_pattern_leads}, AI: {total_ai_leads})")
-        
-        logger.log("info", "lead_processing_handler_end", total_leads=total_leads)
+        _emit("lead_processing_handler_end", source_url=source_url, total_leads=total_leads,
+              pattern_leads=total_pattern_leads, ai_leads=total_ai_leads, stored_leads=len(stored_ids))
         return {"pattern_leads": pattern_leads, "structured_leads": structured_leads, "ai_leads": scored, "pattern_lead_objects": pattern_lead_objects}
         
     except Exception as e:
@@ -328,92 +437,67 @@ def lead_processing_handler(job: Job):
         return {"pattern_leads": {}, "structured_leads": {}, "ai_leads": [], "pattern_lead_objects": [], "error": error_msg}
 
 @app.post("/search", response_model=SearchJobResponse)
-def submit_search_job(req: SearchJobRequest):
-    job = Job('search', req.model_dump(), priority=req.priority)
+async def submit_search_job(req: SearchJobRequest):
+    job = Job('search', req, priority=req.priority)
     job_queue.add_job(job)
-    logger.log("info", "submit_search_job", job_id=job.id, status="queued", submitted_at=job.created_at)
+    _emit("submit_search_job", job_id=job.id, status="queued", submitted_at=job.created_at)
     return SearchJobResponse(job_id=job.id, status="queued", submitted_at=job.created_at)
 
 @app.post("/crawl", response_model=CrawlJobResponse)
-def submit_crawl_job(req: CrawlJobRequest):
-    job = Job('crawl', req.model_dump(), priority=req.priority)
+async def submit_crawl_job(req: CrawlJobRequest):
+    job = Job('crawl', req, priority=req.priority)
     job_queue.add_job(job)
-    logger.log("info", "submit_crawl_job", job_id=job.id, status="queued", submitted_at=job.created_at)
+    _emit("submit_crawl_job", job_id=job.id, status="queued", submitted_at=job.created_at)
     return CrawlJobResponse(job_id=job.id, status="queued", submitted_at=job.created_at)
 
 @app.post("/leads/process", response_model=dict)
-def process_leads(text: str = '', html: str = ''):
+async def process_leads(text: str = '', html: str = ''):
     job = Job('lead_processing', {'text': text, 'html': html})
     job_queue.add_job(job)
-    logger.log("info", "process_leads", job_id=job.id, status="queued", submitted_at=job.created_at)
+    _emit("process_leads", job_id=job.id, status="queued", submitted_at=job.created_at)
     return {"job_id": job.id, "status": "queued", "submitted_at": job.created_at}
 
 @app.post("/search_and_crawl", response_model=dict)
-def search_and_crawl(req: SearchJobRequest, background_tasks: BackgroundTasks):
+async def search_and_crawl(req: SearchJobRequest, background_tasks: BackgroundTasks):
     integration_debug_logger.info("[search_and_crawl] Submitting search job...")
-    job = Job('search', req.model_dump(), priority=req.priority)
+    job = Job('search', req, priority=req.priority)
     job_queue.add_job(job)
     integration_debug_logger.info(f"[search_and_crawl] Search job submitted: {job.id}")
-    def chain_crawl_jobs():
-        import time
-        # Wait for search job to complete with better timeout handling
+    async def chain_crawl_jobs():
+        # Wait for the worker to signal completion instead of polling the job table
         timeout = 45  # Reduced timeout to prevent hanging
-        poll_interval = 0.5  # Faster polling
-        waited = 0
-        max_retries = 3
-        retry_count = 0
-        
-        while waited < timeout and retry_count < max_retries:
-            try:
-                j = job_queue.get_job(job.id)
-                if j and j.status == 'completed' and j.result:
-                    integration_debug_logger.info(f"[search_and_crawl] Search job {job.id} completed. Result: {j.result}")
-                    search_results = j.result.get('search_results', [])
-                    integration_debug_logger.info(f"[search_and_crawl] URLs to crawl: {[item.get('url') for item in search_results]}")
-                    
-                    # Limit the number of crawl jobs to prevent overwhelming the system
-                    max_crawl_jobs = 10
-                    crawl_jobs_created = 0
-                    
-                    for idx, item in enumerate(search_results):
-                        if crawl_jobs_created >= max_crawl_jobs:
-                            integration_debug_logger.info(f"[search_and_crawl] Reached max crawl jobs limit ({max_crawl_jobs})")
-                            break
-                            
-                        url = item.get('url') or item.get('link')
-                        if url:
-                            try:
-                                crawl_job = Job('crawl', {'url': url})
-                                job_queue.add_job(crawl_job)
-                                crawl_jobs_created += 1
-                                integration_debug_logger.info(f"[search_and_crawl] Submitted crawl job for URL {url} (job_id={crawl_job.id})")
-                            except Exception as e:
-                                integration_debug_logger.error(f"[search_and_crawl] Failed to create crawl job for {url}: {e}")
-                                continue
-                    return
-                elif j and j.status == 'failed':
-                    integration_debug_logger.error(f"[search_and_crawl] Search job {job.id} failed: {j.error}")
-                    return
-                elif j and j.status == 'cancelled':
-                    integration_debug_logger.error(f"[search_and_crawl] Search job {job.id} was cancelled")
-                    return
-                elif not j:
-                    integration_debug_logger.warning(f"[search_and_crawl] Job {job.id} not found, retrying...")
-                    retry_count += 1
-                    
-            except Exception as e:
-                integration_debug_logger.error(f"[search_and_crawl] Error checking job status: {e}")
-                retry_count += 1
-                
-            time.sleep(poll_interval)
-            waited += poll_interval
-            
-        integration_debug_logger.error(f"[search_and_crawl] Timeout waiting for search job {job.id} to complete after {timeout} seconds.")
+        try:
+            await asyncio.wait_for(job.done_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            integration_debug_logger.error(f"[search_and_crawl] Timeout waiting for search job {job.id} to complete after {timeout} seconds.")
+            return
+
+        if job.status == 'completed' and job.result:
+            integration_debug_logger.info(f"[search_and_crawl] Search job {job.id} completed. Result: {job.result}")
+            search_results = job.result.get('search_results', [])
+            integration_debug_logger.info(f"[search_and_crawl] URLs to crawl: {[item.get('url') for item in search_results]}")
+
+            # Limit the number of URLs to prevent overwhelming the system
+            max_crawl_urls = 10
+            urls = [u for u in (item.get('url') or item.get('link') for item in search_results) if u][:max_crawl_urls]
+
+            # One batch job fetches all URLs concurrently instead of one job per URL
+            if urls:
+                try:
+                    crawl_job = Job('crawl', {'urls': urls})
+                    job_queue.add_job(crawl_job)
+                    integration_debug_logger.info(f"[search_and_crawl] Submitted crawl job for {len(urls)} URLs (job_id={crawl_job.id})")
+                except Exception as e:
+                    integration_debug_logger.error(f"[search_and_crawl] Failed to create crawl job for {urls}: {e}")
+        elif job.status == 'failed':
+            integration_debug_logger.error(f"[search_and_crawl] Search job {job.id} failed: {job.error}")
+        else:
+            integration_debug_logger.warning(f"[search_and_crawl] Search job {job.id} finished with status {job.status} and no results")
     background_tasks.add_task(chain_crawl_jobs)
     return {"search_job_id": job.id, "status": "search_queued"}
 
 @app.get("/jobs/{job_id}", response_model=dict)
-def get_job_status(job_id: str):
+async def get_job_status(job_id: str):
     job = job_queue.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -424,40 +508,64 @@ def get_job_status(job_id: str):
         "progress": job.progress,
         "result": job.result,
         "error": job.error,
-        "payload": job.payload,  # ADD PAYLOAD FOR URL
+        "payload": job.payload_dict,  # ADD PAYLOAD FOR URL
         "created_at": job.created_at,
         "updated_at": job.updated_at
     }
 
+@app.get("/jobs/{job_id}/status", response_model=dict)
+async def get_job_status_only(job_id: str):
+    """Just the job's status, for pollers that don't need its (possibly large) result"""
+    job = job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job.id, "status": job.status}
+
 @app.get("/jobs", response_model=List[dict])
-def list_jobs():
+async def list_jobs(limit: int = Query(100, ge=1, le=1000, description="Maximum number of jobs to return"),
+                    offset: int = Query(0, ge=0, description="Number of jobs to skip"),
+                    type: Optional[str] = Query(None, description="Only jobs of this type"),
+                    status: Optional[str] = Query(None, description="Only jobs in this status")):
+    """List jobs, newest first"""
     return [
         {
             "job_id": job.id,
             "type": job.type,
             "status": job.status,
             "progress": job.progress,
-            "payload": job.payload,  # ADD PAYLOAD FOR URL
+            "payload": job.payload_dict,  # ADD PAYLOAD FOR URL
             "created_at": job.created_at,
             "updated_at": job.updated_at
         }
-        for job in job_queue.all_jobs()
+        for job in job_queue.list_jobs(job_type=type, status=status, limit=limit, offset=offset)
     ]
 
 @app.get("/status", response_model=dict)
-def system_status():
+async def system_status():
     return {
-        "search_jobs": len([j for j in job_queue.all_jobs() if j.type == 'search' and j.status in ('pending', 'in_progress')]),
-        "crawl_jobs": len([j for j in job_queue.all_jobs() if j.type == 'crawl' and j.status in ('pending', 'in_progress')]),
+        "search_jobs": job_queue.count('search', 'pending', 'in_progress'),
+        "crawl_jobs": job_queue.count('crawl', 'pending', 'in_progress'),
         "leads": len(leads_store),
         "timestamp": datetime.utcnow().isoformat()
     }
 
 @app.get("/export", response_model=List[LeadResponse])
-def export_leads():
+async def export_leads(limit: Optional[int] = Query(None, ge=1, description="Maximum number of leads to return")):
+    # Returning a Response skips FastAPI's response_model pass; the model stays for the docs
+    leads = await cached_response("export", _build_export)
+    return ORJSONResponse(leads[:limit] if limit else leads)
+
+@app.get("/export/count", response_model=dict)
+async def export_leads_count():
+    """Number of leads /export would return, without sending them"""
+    return {"count": len(await cached_response("export", _build_export))}
+
+async def _build_export():
+    # Leads come from our own storage, so model_construct only fills the schema
+    # defaults (id, created_at) and skips re-validation; rows go straight to orjson
     # Try to get leads from database first, fallback to memory
     try:
-        db_leads = lead_storage.get_leads_from_db()
+        db_leads = await asyncio.to_thread(lead_storage.get_leads_from_db)
         if db_leads:
             mapped_leads = []
             for lead in db_leads:
@@ -480,7 +588,7 @@ def export_leads():
                     }
                     # Remove None values to avoid validation issues
                     mapped_lead = {k: v for k, v in mapped_lead.items() if v is not None}
-                    mapped_leads.append(LeadResponse(**mapped_lead))
+                    mapped_leads.append(dict(LeadResponse.model_construct(**mapped_lead)))
                 except Exception as e:
                     integration_debug_logger.error(f"[export_leads] Failed to map database lead: {lead}, error: {e}")
                     continue
@@ -490,7 +598,7 @@ def export_leads():
     
     # Fallback to memory store
     mapped_leads = []
-    for lead in leads_store:
+    for lead in leads_store.to_rows():
         try:
             # Map AI extraction fields to LeadResponse schema
             mapped_lead = {
@@ -510,7 +618,7 @@ def export_leads():
             }
             # Remove None values to avoid validation issues
             mapped_lead = {k: v for k, v in mapped_lead.items() if v is not None}
-            mapped_leads.append(LeadResponse(**mapped_lead))
+            mapped_leads.append(dict(LeadResponse.model_construct(**mapped_lead)))
         except Exception as e:
             # Log the problematic lead and skip it
             integration_debug_logger.error(f"[export_leads] Failed to map memory lead: {lead}, error: {e}")
@@ -530,43 +638,35 @@ def add_lead(lead: LeadResponse):
     leads_store.append(lead_dict)
     # Store in database
     lead_storage.store_lead_in_db(lead_dict)
+    leads_store.bump_version()
     return LeadResponse(**lead_dict)
 
-@app.get("/export/csv", response_class=FileResponse)
-def export_leads_csv():
+@app.get("/export/csv", response_class=StreamingResponse)
+async def export_leads_csv():
+    leads = []
     try:
         # Try to get leads from database first
-        db_leads = lead_storage.get_leads_from_db()
-        if db_leads:
-            filepath = lead_storage.export_leads_to_csv(db_leads)
-            filename = os.path.basename(filepath)
-            return FileResponse(filepath, filename=filename, media_type="text/csv")
+        leads = await asyncio.to_thread(lead_storage.get_leads_from_db)
     except Exception as e:
         integration_debug_logger.error(f"[export_leads_csv] Failed to export from database: {e}")
     
-    # Fallback to memory store
-    if leads_store:
-        filepath = lead_storage.export_leads_to_csv(leads_store)
-        filename = os.path.basename(filepath)
-        return FileResponse(filepath, filename=filename, media_type="text/csv")
-    
-    # If no leads in database or memory, create empty CSV
-    try:
-        empty_leads = []
-        filepath = lead_storage.export_leads_to_csv(empty_leads, "empty_leads.csv")
-        filename = os.path.basename(filepath)
-        return FileResponse(filepath, filename=filename, media_type="text/csv")
-    except Exception as e:
-        integration_debug_logger.error(f"[export_leads_csv] Failed to create empty CSV: {e}")
-        raise HTTPException(status_code=500, detail="Failed to create CSV export")
+    # Fallback to memory store; with no leads at all this streams a header-only CSV
+    if not leads:
+        leads = leads_store.to_rows()
+    filename = timestamped_filename("leads", "csv") if leads else "empty_leads.csv"
+    return StreamingResponse(
+        lead_storage.iter_leads_csv(leads),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @app.get("/export/excel", response_class=FileResponse)
-def export_leads_excel():
+async def export_leads_excel():
     try:
         # Try to get leads from database first
-        db_leads = lead_storage.get_leads_from_db()
+        db_leads = await asyncio.to_thread(lead_storage.get_leads_from_db)
         if db_leads:
-            filepath = lead_storage.export_leads_to_excel(db_leads)
+            filepath = await lead_storage.export_leads_to_excel_async(db_leads)
             filename = os.path.basename(filepath)
             return FileResponse(filepath, filename=filename, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
     except Exception as e:
@@ -576,29 +676,31 @@ def export_leads_excel():
     if not leads_store:
         raise HTTPException(status_code=404, detail="No leads to export")
     
-    filepath = lead_storage.export_leads_to_excel(leads_store)
+    filepath = await lead_storage.export_leads_to_excel_async(leads_store.to_rows())
     filename = os.path.basename(filepath)
     return FileResponse(filepath, filename=filename, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
-@app.get("/export/json", response_class=FileResponse)
-def export_leads_json():
+@app.get("/export/json", response_class=StreamingResponse)
+async def export_leads_json():
+    leads = []
     try:
         # Try to get leads from database first
-        db_leads = lead_storage.get_leads_from_db()
-        if db_leads:
-            filepath = lead_storage.export_leads_to_json(db_leads)
-            filename = os.path.basename(filepath)
-            return FileResponse(filepath, filename=filename, media_type="application/json")
+        leads = await asyncio.to_thread(lead_storage.get_leads_from_db)
     except Exception as e:
         integration_debug_logger.error(f"[export_leads_json] Failed to export from database: {e}")
     
     # Fallback to memory store
-    if not leads_store:
+    if not leads:
+        leads = leads_store.to_rows()
+    if not leads:
         raise HTTPException(status_code=404, detail="No leads to export")
     
-    filepath = lead_storage.export_leads_to_json(leads_store)
-    filename = os.path.basename(filepath)
-    return FileResponse(filepath, filename=filename, media_type="application/json")
+    filename = timestamped_filename("leads", "json")
+    return StreamingResponse(
+        lead_storage.iter_leads_json(leads),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @app.get("/metrics", response_model=dict)
 def system_metrics():
@@ -614,10 +716,12 @@ def log_event(event: str, level: str = "info", details: dict = {}):
     return {"status": "logged"} 
 
 @app.get("/leads/stats", response_model=dict)
-def get_lead_stats():
+async def get_lead_stats():
     """Get lead statistics from database"""
     try:
-        db_count = lead_storage.get_lead_count_from_db()
+        db_count = await cached_response(
+            "lead_count", lambda: asyncio.to_thread(lead_storage.get_lead_count_from_db)
+        )
         memory_count = len(leads_store)
         
         return {
@@ -635,36 +739,14 @@ def get_lead_stats():
             "timestamp": datetime.utcnow().isoformat()
         }
 
-@app.get("/leads/db", response_model=List[LeadResponse])
+@app.get("/leads/db", response_class=ORJSONResponse)
 def get_leads_from_db(limit: Optional[int] = Query(None, description="Maximum number of leads to return"), 
                       offset: int = Query(0, description="Number of leads to skip")):
     """Get leads from database"""
     try:
         db_leads = lead_storage.get_leads_from_db(limit=limit, offset=offset)
-        mapped_leads = []
-        for lead in db_leads:
-            try:
-                mapped_lead = {
-                    "id": lead.get("id", None),
-                    "business_name": lead.get("business_name", None),
-                    "contact_person": lead.get("contact_person", None),
-                    "email": lead.get("email", None),
-                    "phone": lead.get("phone", None),
-                    "address": lead.get("address", None),
-                    "website": lead.get("website", None),
-                    "lead_type": lead.get("lead_type", None),
-                    "confidence_score": lead.get("confidence_score", None),
-                    "extraction_method": lead.get("extraction_method", None),
-                    "created_at": lead.get("created_at", None),
-                    "scoring": lead.get("scoring", None),
-                    "source_url": lead.get("source_url", None)
-                }
-                mapped_lead = {k: v for k, v in mapped_lead.items() if v is not None}
-                mapped_leads.append(LeadResponse(**mapped_lead))
-            except Exception as e:
-                integration_debug_logger.error(f"[get_leads_from_db] Failed to map lead: {lead}, error: {e}")
-                continue
-        return mapped_leads
+        # Read-only view of our own rows: serialise them directly, no model round-trip
+        return ORJSONResponse([{k: v for k, v in lead.items() if v is not None} for lead in db_leads])
     except Exception as e:
         integration_debug_logger.error(f"[get_leads_from_db] Error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve leads from database: {str(e)}")
@@ -683,15 +765,19 @@ def export_all_leads():
             integration_debug_logger.error(f"[export_all_leads] Failed to get leads from database: {e}")
         
         if not leads_to_export:
-            leads_to_export = leads_store
+            leads_to_export = leads_store.to_rows()
         
         if not leads_to_export:
             raise HTTPException(status_code=404, detail="No leads to export")
         
-        # Export to all formats
-        csv_file = lead_storage.export_leads_to_csv(leads_to_export)
-        excel_file = lead_storage.export_leads_to_excel(leads_to_export)
-        json_file = lead_storage.export_leads_to_json(leads_to_export)
+        # Export to all formats; the three writers are independent, so run them side by side
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            csv_future = executor.submit(lead_storage.export_leads_to_csv, leads_to_export)
+            excel_future = executor.submit(lead_storage.export_leads_to_excel, leads_to_export)
+            json_future = executor.submit(lead_storage.export_leads_to_json, leads_to_export)
+            csv_file = csv_future.result()
+            excel_file = excel_future.result()
+            json_file = json_future.result()
         
         return {
             "message": f"Successfully exported {len(leads_to_export)} leads to all formats",
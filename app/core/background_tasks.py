@@ -1,9 +1,14 @@
 import asyncio
 import time
-from typing import Dict, Any, Callable, Optional, List
-from collections import deque
+from typing import Dict, Any, Callable, Optional, List, Union
+from collections import deque, defaultdict
 from datetime import datetime
 import threading
+import itertools
+import heapq
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import cached_property
+from pydantic import BaseModel
 import logging
 import os
 
@@ -17,9 +22,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger("integration_debug")
 
+# Shared by all workers to run handlers under a timeout without spawning a thread per job
+_WORKER_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="jobwork")
+
+# Disambiguates jobs created within the same millisecond (e.g. fan-out from one handler)
+_job_seq = itertools.count()
+
 class Job:
-    def __init__(self, job_type: str, payload: dict, priority: int = 0):
-        self.id = f"job-{int(time.time() * 1000)}"
+    def __init__(self, job_type: str, payload: Union[dict, BaseModel], priority: int = 0):
+        self.id = f"job-{int(time.time() * 1000)}-{next(_job_seq)}"
         self.type = job_type
         self.payload = payload
         self.priority = priority
@@ -32,36 +43,81 @@ class Job:
         self.cancelled = False
         self.retries = 0
         self.max_retries = 2
+        # Set (via the worker's loop) once the job reaches a terminal state
+        self.done_event = asyncio.Event()
+
+    @cached_property
+    def payload_dict(self) -> dict:
+        # Request models are stored as-is and only dumped once, on first access
+        if isinstance(self.payload, BaseModel):
+            return self.payload.model_dump()
+        return self.payload
 
 class JobQueue:
     def __init__(self):
-        self.queue: List[Job] = []
+        # One min-heap of (priority, created_at, id, job) per job type
+        self.queues: Dict[str, list] = defaultdict(list)
         self.jobs: Dict[str, Job] = {}
         self.lock = threading.Lock()
+        # Jobs indexed by (type, status), (type, None) and (None, status); the inner
+        # dicts keep insertion order, so each bucket is an O(1)-update ordered set
+        self._index: Dict[tuple, Dict[str, Job]] = defaultdict(dict)
 
     def add_job(self, job: Job):
         with self.lock:
-            self.queue.append(job)
-            self.queue.sort(key=lambda j: (j.priority, j.created_at))
+            heapq.heappush(self.queues[job.type], (job.priority, job.created_at, job.id, job))
             self.jobs[job.id] = job
+            for key in ((job.type, job.status), (job.type, None), (None, job.status)):
+                self._index[key][job.id] = job
 
-    def get_next_job(self) -> Optional[Job]:
+    def _transition(self, job: Job, status: str):
+        # Caller must hold self.lock
+        for key in ((job.type, job.status), (None, job.status)):
+            self._index[key].pop(job.id, None)
+        for key in ((job.type, status), (None, status)):
+            self._index[key][job.id] = job
+        job.status = status
+        job.updated_at = datetime.utcnow()
+
+    def set_status(self, job: Job, status: str):
         with self.lock:
-            for i, job in enumerate(self.queue):
-                if job.status == 'pending' and not job.cancelled:
-                    job.status = 'in_progress'
-                    job.updated_at = datetime.utcnow()
-                    return self.queue.pop(i)
+            self._transition(job, status)
+
+    def count(self, job_type: str, *statuses: str) -> int:
+        return sum(len(self._index.get((job_type, status), ())) for status in statuses)
+
+    def list_jobs(self, job_type: Optional[str] = None, status: Optional[str] = None,
+                  limit: int = 100, offset: int = 0) -> List[Job]:
+        """Newest-first page of jobs, optionally filtered by type and/or status"""
+        with self.lock:
+            bucket = self.jobs if job_type is None and status is None else self._index.get((job_type, status), {})
+            return list(itertools.islice(reversed(bucket.values()), offset, offset + limit))
+
+    def _pop_ready(self, heap: list) -> Optional[Job]:
+        # Caller must hold self.lock; cancelled entries are dropped lazily here
+        while heap:
+            job = heap[0][-1]
+            if job.status == 'pending' and not job.cancelled:
+                heapq.heappop(heap)
+                self._transition(job, 'in_progress')
+                return job
+            heapq.heappop(heap)
         return None
 
+    def get_next_job(self) -> Optional[Job]:
+        with self.lock:
+            for heap in self.queues.values():
+                while heap and (heap[0][-1].status != 'pending' or heap[0][-1].cancelled):
+                    heapq.heappop(heap)
+            heads = [heap for heap in self.queues.values() if heap]
+            if not heads:
+                return None
+            return self._pop_ready(min(heads, key=lambda heap: heap[0][:3]))
+
     def get_next_job_of_type(self, job_type: str) -> Optional[Job]:
         with self.lock:
-            for i, job in enumerate(self.queue):
-                if job.status == 'pending' and not job.cancelled and job.type == job_type:
-                    job.status = 'in_progress'
-                    job.updated_at = datetime.utcnow()
-                    return self.queue.pop(i)
-        return None
+            heap = self.queues.get(job_type)
+            return self._pop_ready(heap) if heap else None
 
     def get_job(self, job_id: str) -> Optional[Job]:
         return self.jobs.get(job_id)
@@ -70,8 +126,7 @@ class JobQueue:
         job = self.get_job(job_id)
         if job:
             job.cancelled = True
-            job.status = 'cancelled'
-            job.updated_at = datetime.utcnow()
+            self.set_status(job, 'cancelled')
 
     def update_progress(self, job_id: str, progress: float):
         job = self.get_job(job_id)
@@ -83,92 +138,51 @@ class JobQueue:
         return list(self.jobs.values())
 
 class BaseWorker(threading.Thread):
-    def __init__(self, job_queue: JobQueue, handler: Callable[[Job], Any], job_type: str, poll_interval: float = 1.0, job_timeout: float = 60.0):
+    def __init__(self, job_queue: JobQueue, handler: Callable[[Job], Any], job_type: str, poll_interval: float = 1.0, job_timeout: float = 60.0,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
         super().__init__(daemon=True)
         self.job_queue = job_queue
         self.handler = handler
         self.job_type = job_type
         self.poll_interval = poll_interval
         self.job_timeout = job_timeout
+        # Event loop that awaits Job.done_event (asyncio.Event is not thread-safe)
+        self.loop = loop
         self.running = True
 
     def run(self):
         while self.running:
             job = self.job_queue.get_next_job_of_type(self.job_type)
             if job:
-                logger.info(f"[BaseWorker] Handling job: id={job.id}, type={job.type}, payload={job.payload}")
+                logger.info("[BaseWorker] Handling job: id=%s, type=%s", job.id, job.type)
+                # Lead payloads carry whole pages of HTML; only format them when debugging
+                logger.debug("[BaseWorker] Job %s payload=%s", job.id, job.payload)
+                future = _WORKER_POOL.submit(self.handler, job)
                 try:
-                    # Use threading.Timer for cross-platform timeout handling
-                    import threading
-                    import queue
-                    
-                    # Create a queue to communicate between threads
-                    result_queue = queue.Queue()
-                    exception_queue = queue.Queue()
-                    
-                    def job_worker():
-                        try:
-                            result = self.handler(job)
-                            result_queue.put(('success', result))
-                        except Exception as e:
-                            exception_queue.put(('error', e))
-                    
-                    # Start the job in a separate thread
-                    worker_thread = threading.Thread(target=job_worker, daemon=True)
-                    worker_thread.start()
-                    
-                    # Wait for completion with timeout
-                    try:
-                        worker_thread.join(timeout=self.job_timeout)
-                        
-                        if worker_thread.is_alive():
-                            # Job timed out
-                            logger.error(f"[BaseWorker] Job {job.id} timed out after {self.job_timeout} seconds")
-                            job.error = f"Job timed out after {self.job_timeout} seconds"
-                            job.status = 'failed'
-                            job.progress = 1.0
-                            job.updated_at = datetime.utcnow()
-                        else:
-                            # Check for exceptions first
-                            try:
-                                exc_type, exc_value = exception_queue.get_nowait()
-                                logger.error(f"[BaseWorker] Handler {self.handler.__name__} failed for job {job.id}: {exc_value}")
-                                job.error = str(exc_value)
-                                job.status = 'failed'
-                                job.progress = 1.0
-                                job.updated_at = datetime.utcnow()
-                            except queue.Empty:
-                                # No exception, check for result
-                                try:
-                                    result_type, result = result_queue.get_nowait()
-                                    logger.info(f"[BaseWorker] Handler {self.handler.__name__} returned result for job {job.id}")
-                                    job.result = result
-                                    job.status = 'completed'
-                                    job.progress = 1.0
-                                    job.updated_at = datetime.utcnow()
-                                except queue.Empty:
-                                    # This shouldn't happen, but handle it gracefully
-                                    logger.error(f"[BaseWorker] No result or exception for job {job.id}")
-                                    job.error = "No result or exception returned"
-                                    job.status = 'failed'
-                                    job.progress = 1.0
-                                    job.updated_at = datetime.utcnow()
-                                    
-                    except Exception as e:
-                        logger.error(f"[BaseWorker] Unexpected error handling job {job.id}: {e}")
-                        job.error = str(e)
-                        job.status = 'failed'
-                        job.progress = 1.0
-                        job.updated_at = datetime.utcnow()
-                            
+                    result = future.result(timeout=self.job_timeout)
+                    logger.info(f"[BaseWorker] Handler {self.handler.__name__} returned result for job {job.id}")
+                    job.result = result
+                    job.progress = 1.0
+                    self.job_queue.set_status(job, 'completed')
+                except FuturesTimeoutError:
+                    # A running handler can't be interrupted; its result is simply discarded
+                    future.cancel()
+                    logger.error(f"[BaseWorker] Job {job.id} timed out after {self.job_timeout} seconds")
+                    job.error = f"Job timed out after {self.job_timeout} seconds"
+                    job.progress = 1.0
+                    self.job_queue.set_status(job, 'failed')
                 except Exception as e:
                     logger.error(f"[BaseWorker] Handler {self.handler.__name__} failed for job {job.id}: {e}")
                     job.error = str(e)
-                    job.status = 'failed'
                     job.progress = 1.0
-                    job.updated_at = datetime.utcnow()
+                    self.job_queue.set_status(job, 'failed')
+                self._notify_done(job)
             time.sleep(self.poll_interval)
 
+    def _notify_done(self, job: Job):
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(job.done_event.set)
+
     def stop(self):
         self.running = False
 
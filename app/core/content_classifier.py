@@ -1,5 +1,6 @@
 import re
-from typing import Dict, Any, List
+from collections import Counter
+from typing import Dict, Any, FrozenSet, List, Optional, Set, Tuple
 
 TRAVEL_VERTICALS = [
     "hotel", "resort", "hostel", "restaurant", "cafe", "tour operator", "travel agency", "blogger", "event organizer"
@@ -17,56 +18,108 @@ INFORMATIONAL_KEYWORDS = ["guide", "tips", "review", "blog", "information", "how
 
 SPAM_PATTERNS = [r"free\s+gift", r"click here", r"subscribe now", r"win\s+money"]
 
+_WORD_RE = re.compile(r"\b\w{4,}\b")
+_TOKEN_RE = re.compile(r"\w+")
+_SPAM_RE = re.compile("|".join(f"(?:{p})" for p in SPAM_PATTERNS), re.IGNORECASE)
+
+def _trie_pattern(words: List[str]) -> str:
+    """Prefix-factored alternation ("re(?:sort|staurant)") so shared prefixes are matched once"""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of word
+
+    def build(node: Dict[str, Any]) -> str:
+        ends = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+def keyword_regex(categories: Dict[str, List[str]]) -> Tuple["re.Pattern", List[str], FrozenSet[str]]:
+    """One alternation over every keyword, with a named group per category (g0, g1, ...),
+    plus the single-word keywords of the first category for token-set lookups"""
+    labels = list(categories)
+    alternation = "|".join(
+        f"(?P<g{i}>{_trie_pattern(categories[label])})"
+        for i, label in enumerate(labels)
+    )
+    head_words = frozenset(kw for kw in categories[labels[0]] if " " not in kw)
+    return re.compile(alternation), labels, head_words
+
+def first_category(compiled: Tuple["re.Pattern", List[str], FrozenSet[str]], text_l: str,
+                   tokens: Optional[Set[str]] = None) -> Optional[str]:
+    """Earliest-listed category with a keyword anywhere in text_l (same answer as checking categories in order)"""
+    rx, labels, head_words = compiled
+    # A whole-word hit on the first category settles it without scanning; keywords still
+    # match as substrings ("hotels", "booking") through the regex below
+    if tokens is not None and not tokens.isdisjoint(head_words):
+        return labels[0]
+    found = set()
+    pos = 0
+    while True:
+        m = rx.search(text_l, pos)
+        if m is None:
+            break
+        idx = int(m.lastgroup[1:])
+        if idx == 0:
+            return labels[0]
+        found.add(idx)
+        # Step one character, not past the match, so overlapping keywords are still seen
+        pos = m.start() + 1
+    return labels[min(found)] if found else None
+
+_CONTENT_TYPE_RE = keyword_regex(CONTENT_TYPES)
+_VERTICAL_RE = keyword_regex({v: [v] for v in TRAVEL_VERTICALS})
+_INTENT_RE = keyword_regex({"commercial": COMMERCIAL_KEYWORDS, "informational": INFORMATIONAL_KEYWORDS})
+
 
 def classify_content_type(text: str) -> str:
-    text_l = text.lower()
-    for ctype, keywords in CONTENT_TYPES.items():
-        for kw in keywords:
-            if kw in text_l:
-                return ctype
-    return "other"
+    return first_category(_CONTENT_TYPE_RE, text.lower()) or "other"
 
 def classify_vertical(text: str) -> str:
-    text_l = text.lower()
-    for v in TRAVEL_VERTICALS:
-        if v in text_l:
-            return v
-    return "other"
+    return first_category(_VERTICAL_RE, text.lower()) or "other"
 
 def classify_intent(text: str) -> str:
-    text_l = text.lower()
-    if any(kw in text_l for kw in COMMERCIAL_KEYWORDS):
-        return "commercial"
-    if any(kw in text_l for kw in INFORMATIONAL_KEYWORDS):
-        return "informational"
-    return "unknown"
-
-def score_content_quality(text: str) -> float:
-    # Simple heuristic: length and keyword presence
+    return first_category(_INTENT_RE, text.lower()) or "unknown"
+
+def score_content_quality(text: str, text_l: Optional[str] = None) -> float:
+    """Simple heuristic: length and keyword presence. Pass text_l when the caller already lowercased text"""
+    if text_l is None:
+        text_l = text.lower()
     length_score = min(len(text) / 1000, 1.0)
-    keyword_score = 0.2 if any(kw in text.lower() for kw in TRAVEL_VERTICALS) else 0.0
-    return round(length_score + keyword_score, 2)
+    if _VERTICAL_RE[0].search(text_l) is None:
+        return round(length_score, 2)
+    if length_score >= 1.0:
+        return 1.2
+    return round(length_score + 0.2, 2)
 
 def detect_spam(text: str) -> bool:
-    for pat in SPAM_PATTERNS:
-        if re.search(pat, text, re.IGNORECASE):
-            return True
-    return False
+    return _SPAM_RE.search(text) is not None
 
 def extract_keywords(text: str, top_n: int = 10) -> List[str]:
-    words = re.findall(r"\b\w{4,}\b", text.lower())
-    freq = {}
-    for w in words:
-        freq[w] = freq.get(w, 0) + 1
-    sorted_words = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-    return [w for w, _ in sorted_words[:top_n]]
+    words = _WORD_RE.findall(text.lower())
+    return [w for w, _ in Counter(words).most_common(top_n)]
 
 def classify_content(text: str) -> Dict[str, Any]:
+    # Lowercase and tokenize once and answer every question from the same buffers
+    text_l = text.lower()
+    all_tokens = _TOKEN_RE.findall(text_l)
+    tokens = set(all_tokens)
+    # A whole \w run of 4+ characters is exactly what _WORD_RE matches
+    words = [w for w in all_tokens if len(w) >= 4]
     return {
-        "type": classify_content_type(text),
-        "vertical": classify_vertical(text),
-        "intent": classify_intent(text),
-        "quality_score": score_content_quality(text),
-        "is_spam": detect_spam(text),
-        "keywords": extract_keywords(text),
-    } 
\ No newline at end of file
+        "type": first_category(_CONTENT_TYPE_RE, text_l, tokens) or "other",
+        "vertical": first_category(_VERTICAL_RE, text_l, tokens) or "other",
+        "intent": first_category(_INTENT_RE, text_l, tokens) or "unknown",
+        "quality_score": score_content_quality(text, text_l),
+        "is_spam": _SPAM_RE.search(text_l) is not None,
+        "keywords": [w for w, _ in Counter(words).most_common(10)],
+    }
@@ -1,50 +1,81 @@
-from bs4 import BeautifulSoup
+from lxml import etree
 import re
 import json
 from typing import Dict, Any, Optional, List
+from app.core.text_cleaner import parse_html_document
+
+BOILERPLATE_TAGS = ("nav", "header", "footer", "aside", "script", "style", "noscript", "iframe", "form", "ads", "svg")
+
+def _text(el) -> str:
+    # Same as BeautifulSoup's get_text(separator=" ", strip=True)
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+def _text_len(el) -> int:
+    # Length of get_text(strip=True), used to rank candidate content blocks
+    return sum(len(t.strip()) for t in el.itertext())
+
+# Title fallbacks, compiled once: <title>, og:title, <meta name="title">, first <h1>
+_TITLE_XPATH = etree.XPath("(//title)[1]")
+_META_OG_TITLE_XPATH = etree.XPath('(//meta[@property="og:title"])[1]/@content')
+_META_NAME_TITLE_XPATH = etree.XPath('(//meta[@name="title"])[1]/@content')
+_H1_XPATH = etree.XPath("(//h1)[1]")
+
+def _extract_title(root) -> str:
+    """Robust title extraction; each fallback is only looked up if the previous one came up empty"""
+    title_el = _TITLE_XPATH(root)
+    if title_el and title_el[0].text and title_el[0].text.strip():
+        return title_el[0].text.strip()
+    og_title = _META_OG_TITLE_XPATH(root)
+    if og_title and og_title[0]:
+        return og_title[0].strip()
+    name_title = _META_NAME_TITLE_XPATH(root)
+    if name_title and name_title[0]:
+        return name_title[0].strip()
+    h1 = _H1_XPATH(root)
+    if h1:
+        return "".join(t.strip() for t in h1[0].itertext())
+    return ""
 
 def parse_html_content(html: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html, "lxml")
-    # Remove navigation, ads, and scripts
-    for tag in soup(["nav", "header", "footer", "aside", "script", "style", "noscript", "iframe", "form", "ads", "svg"]):
-        tag.decompose()
-    # Extract main content area (heuristic: largest <div> or <main>)
-    main_content = soup.find("main")
-    if not main_content:
-        divs = soup.find_all("div")
-        if divs:
-            main_content = max(divs, key=lambda d: len(d.get_text(strip=True)))
-        else:
-            main_content = soup.body or soup
-    text = main_content.get_text(separator=" ", strip=True) if main_content else soup.get_text(separator=" ", strip=True)
+    empty = {"text": "", "meta": {}, "jsonld": [], "microdata": [], "title": "", "language": None}
+    if not html or not html.strip():
+        return empty
+    try:
+        root = parse_html_document(html)
+    except (etree.ParserError, ValueError):
+        return empty
     # Extract meta tags
-    meta = {m.get("name", m.get("property", "")).lower(): m.get("content", "") for m in soup.find_all("meta") if m.get("content")}
-    # Extract structured data (JSON-LD)
+    meta = {(m.get("name") if m.get("name") is not None else m.get("property", "")).lower(): m.get("content")
+            for m in root.iter("meta") if m.get("content")}
+    # Extract structured data (JSON-LD) before scripts are stripped below
     jsonld = []
-    for script in soup.find_all("script", type="application/ld+json"):
+    for script in root.iterfind('.//script[@type="application/ld+json"]'):
         try:
-            jsonld.append(json.loads(script.string))
+            jsonld.append(json.loads(script.text))
         except Exception:
             continue
+    # Remove navigation, ads, and scripts (comments too, which get_text never returned)
+    etree.strip_elements(root, etree.Comment, *BOILERPLATE_TAGS, with_tail=False)
+    # Extract main content area (heuristic: largest <div> or <main>)
+    main_content = root.find(".//main")
+    if main_content is None:
+        divs = list(root.iter("div"))
+        if divs:
+            main_content = max(divs, key=_text_len)
+        else:
+            main_content = root.find("body")
+            if main_content is None:
+                main_content = root
+    text = _text(main_content)
     # Extract microdata (simple)
     microdata = []
-    for tag in soup.find_all(attrs={"itemtype": True}):
-        microdata.append({"itemtype": tag["itemtype"], "properties": tag.attrs})
-    # Robust title extraction
-    title = ""
-    if soup.title and soup.title.string and soup.title.string.strip():
-        title = soup.title.string.strip()
-    elif soup.find("meta", property="og:title") and soup.find("meta", property="og:title").get("content"):
-        title = soup.find("meta", property="og:title")["content"].strip()
-    elif soup.find("meta", attrs={"name": "title"}) and soup.find("meta", attrs={"name": "title"}).get("content"):
-        title = soup.find("meta", attrs={"name": "title"})["content"].strip()
-    elif soup.find("h1") and soup.find("h1").get_text(strip=True):
-        title = soup.find("h1").get_text(strip=True)
+    for tag in root.iterfind(".//*[@itemtype]"):
+        microdata.append({"itemtype": tag.get("itemtype"), "properties": dict(tag.attrib)})
     return {
         "text": text,
         "meta": meta,
         "jsonld": jsonld,
         "microdata": microdata,
-        "title": title,
-        "language": soup.html.get("lang") if soup.html else None,
-    } 
\ No newline at end of file
+        "title": _extract_title(root),
+        "language": root.get("lang"),
+    }
@@ -1,11 +1,68 @@
 import asyncio
 import time
+import threading
+import heapq
+from functools import lru_cache
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Dict, Set, Deque, Optional, List, Tuple
 import requests
 from urllib.parse import urlparse
 import urllib.robotparser
 
+# Process-wide robots.txt cache shared by every CrawlManager: domain -> (parser, fetched_at)
+ROBOTS_TTL = 6 * 3600
+ROBOTS_RETRY_DELAY = 0.25
+_ROBOTS_CACHE: Dict[str, Tuple[urllib.robotparser.RobotFileParser, float]] = {}
+_ROBOTS_PENDING: Dict[str, Future] = {}
+_ROBOTS_LOCK = threading.Lock()
+# Fetches run in the background, many domains in flight at once
+_ROBOTS_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="robots")
+
+def _load_robots(scheme: str, domain: str) -> urllib.robotparser.RobotFileParser:
+    parser = urllib.robotparser.RobotFileParser()
+    try:
+        resp = requests.get(f"{scheme}://{domain}/robots.txt", timeout=5)
+        if resp.status_code == 200:
+            parser.parse(resp.text.splitlines())
+        else:
+            # If robots.txt not found, allow by default
+            parser.allow_all = True
+    except Exception:
+        # On network error, allow by default
+        parser.allow_all = True
+    with _ROBOTS_LOCK:
+        _ROBOTS_CACHE[domain] = (parser, time.time())
+        _ROBOTS_PENDING.pop(domain, None)
+    return parser
+
+def get_robots_parser(scheme: str, domain: str) -> Optional[urllib.robotparser.RobotFileParser]:
+    """
+    Cached robots.txt parser for a domain, or None while it is being fetched.
+    The first miss (or an expired entry) schedules a background fetch instead of blocking.
+    """
+    with _ROBOTS_LOCK:
+        hit = _ROBOTS_CACHE.get(domain)
+        if hit and time.time() - hit[1] < ROBOTS_TTL:
+            return hit[0]
+        if domain not in _ROBOTS_PENDING:
+            _ROBOTS_PENDING[domain] = _ROBOTS_POOL.submit(_load_robots, scheme or "https", domain)
+    return None
+
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """urlparse(url).netloc, with a string-slicing fast path for scheme://host/... URLs"""
+    i = url.find("://")
+    if i <= 0 or not url[:i].isalpha():
+        return urlparse(url).netloc
+    start = i + 3
+    end = len(url)
+    for sep in "/?#":
+        j = url.find(sep, start, end)
+        if j != -1:
+            end = j
+    return url[start:end]
+
 class CrawlJob:
     def __init__(self, url: str, priority: int = 0, domain: Optional[str] = None):
         self.url = url
@@ -18,8 +75,7 @@ class CrawlJob:
 
     @staticmethod
     def extract_domain(url: str) -> str:
-        from urllib.parse import urlparse
-        return urlparse(url).netloc
+        return _netloc(url)
 
     def __lt__(self, other):
         return (self.priority, self.url) < (other.priority, other.url)
@@ -33,7 +89,8 @@ class CrawlManager:
     - Always respect robots.txt in production to avoid legal/ethical issues.
     """
     def __init__(self, max_retries: int = 2, crawl_budget_per_domain: int = 100, politeness_delay: float = 2.0, user_agent: str = '*'):
-        self.queue: List[CrawlJob] = []
+        # (ready_at, priority, url, job): the top is always the job that can run soonest
+        self.heap: List[Tuple[float, int, str, CrawlJob]] = []
         self.visited: Set[str] = set()
         self.failed: Set[str] = set()
         self.in_progress: Set[str] = set()
@@ -43,57 +100,52 @@ class CrawlManager:
         self.politeness_delay = politeness_delay
         self.status: Dict[str, str] = {}  # url -> status
         self.user_agent = user_agent
-        self._robots_parsers: Dict[str, urllib.robotparser.RobotFileParser] = {}
 
-    def _is_allowed_by_robots(self, url: str) -> bool:
+    def _is_allowed_by_robots(self, url: str) -> Optional[bool]:
         """
-        Checks robots.txt for the domain of the given URL. Caches the parser per domain.
-        Returns True if allowed, False if disallowed or robots.txt cannot be fetched.
+        Checks robots.txt for the domain of the given URL using the shared cache.
+        Returns True/False once robots.txt is known, None while it is still being fetched.
         """
         parsed = urlparse(url)
-        domain = parsed.netloc
-        robots_url = f"{parsed.scheme}://{domain}/robots.txt"
-        parser = self._robots_parsers.get(domain)
+        parser = get_robots_parser(parsed.scheme, parsed.netloc)
         if parser is None:
-            parser = urllib.robotparser.RobotFileParser()
-            try:
-                resp = requests.get(robots_url, timeout=5)
-                if resp.status_code == 200:
-                    parser.parse(resp.text.splitlines())
-                else:
-                    # If robots.txt not found, allow by default
-                    self._robots_parsers[domain] = parser
-                    return True
-            except Exception:
-                # On network error, allow by default
-                self._robots_parsers[domain] = parser
-                return True
-            self._robots_parsers[domain] = parser
+            return None
         return parser.can_fetch(self.user_agent, url)
 
     def add_job(self, url: str, priority: int = 0):
         if url in self.visited or url in self.in_progress:
             return
         job = CrawlJob(url, priority)
-        self.queue.append(job)
-        self.queue.sort()  # maintain priority
+        # Start the robots.txt fetch now so it is usually resolved by the time the job is picked
+        get_robots_parser(urlparse(url).scheme, job.domain)
+        heapq.heappush(self.heap, (0.0, job.priority, job.url, job))
         self.status[url] = 'pending'
 
     def get_next_job(self) -> Optional[CrawlJob]:
-        while self.queue:
-            job = self.queue.pop(0)
+        """Pop the next job that may run now, or None if nothing is ready yet (never sleeps)"""
+        while self.heap:
+            now = time.time()
+            ready_at, priority, url, job = self.heap[0]
+            if ready_at > now:
+                return None
+            heapq.heappop(self.heap)
             if job.url in self.visited:
                 continue
-            if not self._is_allowed_by_robots(job.url):
+            allowed = self._is_allowed_by_robots(job.url)
+            if allowed is None:
+                # robots.txt still loading; check again shortly
+                heapq.heappush(self.heap, (now + ROBOTS_RETRY_DELAY, priority, url, job))
+                continue
+            if not allowed:
                 self.status[job.url] = 'skipped_robots'
                 continue
             if self.domain_crawl_budget[job.domain] <= 0:
                 self.status[job.url] = 'skipped'
                 continue
-            now = time.time()
-            if now - self.domain_last_crawl[job.domain] < self.politeness_delay:
-                # Requeue at end for politeness
-                self.queue.append(job)
+            next_allowed = self.domain_last_crawl[job.domain] + self.politeness_delay
+            if next_allowed > now:
+                # Reschedule for when the domain's politeness window opens
+                heapq.heappush(self.heap, (next_allowed, priority, url, job))
                 continue
             self.in_progress.add(job.url)
             self.status[job.url] = 'in_progress'
@@ -118,7 +170,7 @@ class CrawlManager:
             self.status[job.url] = 'failed'
             job.status = 'failed'
         else:
-            self.queue.append(job)
+            heapq.heappush(self.heap, (job.last_attempt, job.priority, job.url, job))
             self.status[job.url] = 'retrying'
             job.status = 'retrying'
 
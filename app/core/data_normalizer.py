@@ -1,75 +1,83 @@
 import re
+from functools import lru_cache
 from typing import Optional
 from datetime import datetime
 import phonenumbers
 import unicodedata
 
+_NON_DIGIT_RE = re.compile(r"\D")
+
 # Phone number normalization (international format)
+@lru_cache(maxsize=10000)
 def normalize_phone(phone: str, default_region: str = "IN") -> str:
     if not phone or not phone.strip():
         return ""
     phone = phone.strip()
-    # 1. If starts with '+', parse as international
-    if phone.startswith('+'):
-        try:
-            parsed = phonenumbers.parse(phone, None)
-            if phonenumbers.is_valid_number(parsed):
-                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        except Exception:
-            pass
-    # 2. If 10 digits and no '+', use default_region to determine country code
-    digits = re.sub(r"\D", "", phone)
-    if len(digits) == 10:
-        try:
-            parsed = phonenumbers.parse(digits, default_region)
-            if phonenumbers.is_valid_number(parsed):
-                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        except Exception:
-            pass
-    # 3. Otherwise, try parsing with default region and accept any valid number
-    try:
-        parsed = phonenumbers.parse(phone, default_region)
-        if phonenumbers.is_valid_number(parsed):
-            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-    except Exception:
-        pass
-    # 4. Try parsing just the digits with default region
+    digits = _NON_DIGIT_RE.sub("", phone)
+    # Fast path: pick the interpretation from the input's shape and parse once;
+    # '+' means international, otherwise the digits are read in default_region
+    fast = (phone, None) if phone.startswith('+') else (digits or phone, default_region)
+    e164 = _to_e164(*fast)
+    if e164:
+        return e164
+    # Fallbacks in default_region: the raw string (phonenumbers handles extensions like
+    # "ext. 12"), then the bare digits (rescues malformed '+' numbers)
+    for candidate in (phone, digits):
+        if candidate and (candidate, default_region) != fast:
+            e164 = _to_e164(candidate, default_region)
+            if e164:
+                return e164
+    return ""
+
+def _to_e164(candidate: str, region: Optional[str]) -> str:
     try:
-        parsed = phonenumbers.parse(digits, default_region)
+        parsed = phonenumbers.parse(candidate, region)
         if phonenumbers.is_valid_number(parsed):
             return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
     except Exception:
         pass
     return ""
 
+_EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+_NAME_JUNK_RE = re.compile(r'[^\w\s\-&]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_CURRENCY_RE = re.compile(r'(\$|USD|EUR|GBP|INR|CAD|AUD)?\s?([\d,.]+)')
+
+# The normalizers below are pure and scraped values repeat heavily, so results are memoized
+
 # Email normalization (lowercase, strip spaces)
+@lru_cache(maxsize=8192)
 def normalize_email(email: str) -> str:
+    # Cheap reject before allocating the stripped/lowercased copy
+    if not email or "@" not in email:
+        return ""
     email = email.strip().lower()
     # Simple regex for email validation
-    if not email:
-        return ""
-    if not re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", email):
+    if not _EMAIL_RE.match(email):
         return ""
     return email
 
 # Business name normalization (strip, title case, remove special chars)
+@lru_cache(maxsize=8192)
 def normalize_business_name(name: str) -> str:
     name = name.strip()
     name = unicodedata.normalize('NFKD', name)
-    name = re.sub(r'[^\w\s\-&]', '', name)
+    name = _NAME_JUNK_RE.sub('', name)
     return name.title()
 
 # Address normalization (strip, collapse whitespace)
+@lru_cache(maxsize=8192)
 def normalize_address(address: str) -> str:
     address = address.strip()
-    address = re.sub(r'\s+', ' ', address)
+    address = _WHITESPACE_RE.sub(' ', address)
     return address
 
 # Currency normalization (extract value and currency, convert to float)
+@lru_cache(maxsize=8192)
 def normalize_currency(text: str) -> float:
     if not text or not text.strip():
         return 0.0
-    match = re.search(r'(\$|USD|EUR|GBP|INR|CAD|AUD)?\s?([\d,.]+)', text)
+    match = _CURRENCY_RE.search(text)
     if match:
         value = match.group(2).replace(',', '')
         try:
@@ -79,11 +87,24 @@ def normalize_currency(text: str) -> float:
     return 0.0
 
 # Date/time normalization (parse to ISO format)
+# Input shape -> candidate formats, in precedence order (day-first wins for dd/mm vs mm/dd)
+_DATE_PATTERNS = [
+    (re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$"), ("%Y-%m-%d",)),
+    (re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$"), ("%d/%m/%Y", "%m/%d/%Y")),
+    (re.compile(r"^\d{1,2}-\d{1,2}-\d{4}$"), ("%d-%m-%Y",)),
+    (re.compile(r"^[A-Za-z]+ \d{1,2}, \d{4}$"), ("%b %d, %Y", "%B %d, %Y")),
+]
+
+@lru_cache(maxsize=8192)
 def normalize_date(text: str) -> Optional[str]:
-    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%b %d, %Y", "%B %d, %Y"):
-        try:
-            dt = datetime.strptime(text.strip(), fmt)
-            return dt.isoformat()
-        except Exception:
+    text = text.strip()
+    for pattern, formats in _DATE_PATTERNS:
+        if not pattern.match(text):
             continue
-    return None 
\ No newline at end of file
+        for fmt in formats:
+            try:
+                return datetime.strptime(text, fmt).isoformat()
+            except ValueError:
+                continue
+        return None
+    return None
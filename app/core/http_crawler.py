@@ -1,10 +1,17 @@
 import httpx
 import asyncio
+import re
+from urllib.parse import urlsplit
 import random
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Union
 from fake_useragent import UserAgent
 
 DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONCURRENCY = 100
+MAX_BODY_BYTES = 5 * 1024 * 1024  # pages beyond this are skipped rather than buffered
+# Response headers copied into crawl results (they end up in job results, so keep them small and plain)
+KEPT_HEADERS = ("content-type", "content-length", "last-modified", "etag")
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Safari/605.1.15",
@@ -16,66 +23,111 @@ CONTENT_TYPES = [
     "text/html", "application/xhtml+xml", "application/xml"
 ]
 
+# <link rel="canonical"> lives in <head>, so only the start of the document is searched
+CANONICAL_SCAN_BYTES = 16384
+CANONICAL_RE = re.compile(r'<link\s+rel=["\']canonical["\']\s+href=["\']([^"\']+)["\']', re.IGNORECASE)
+CANONICAL_BYTES_RE = re.compile(CANONICAL_RE.pattern.encode(), re.IGNORECASE)
+
+# Pool size for the client a crawl opens when no shared client was passed in
+CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+UA_POOL_SIZE = 64
+
+@lru_cache(maxsize=1)
+def _user_agent_pool() -> Tuple[str, ...]:
+    """Rotation pool built on first use: UserAgent() loads its data file, so it's only paid
+    once per process (a crawler is created per job) and never by crawlers that don't fetch"""
+    try:
+        ua = UserAgent()
+        generated = [ua.random for _ in range(UA_POOL_SIZE)]
+    except Exception:
+        generated = []
+    return tuple(generated) + tuple(USER_AGENTS)
+
 class SimpleHttpCrawler:
-    def __init__(self, timeout: int = DEFAULT_TIMEOUT):
+    def __init__(self, timeout: int = DEFAULT_TIMEOUT, client: Optional[httpx.AsyncClient] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
         self.timeout = timeout
-        try:
-            self.ua = UserAgent()
-        except Exception:
-            self.ua = None
+        self.max_concurrency = max_concurrency
+        # Optional shared client; lets callers keep one keep-alive pool across crawls
+        self.client = client
 
     def get_random_user_agent(self) -> str:
-        if self.ua:
-            try:
-                return self.ua.random
-            except Exception:
-                pass
-        return random.choice(USER_AGENTS)
+        return random.choice(_user_agent_pool())
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(follow_redirects=True, timeout=self.timeout, limits=CLIENT_LIMITS)
 
     async def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        if self.client is not None:
+            return await self._fetch_with(self.client, url)
+        async with self._new_client() as client:
+            return await self._fetch_with(client, url)
+
+    async def _fetch_with(self, client: httpx.AsyncClient, url: str) -> Optional[Dict[str, Any]]:
         headers = {
             "User-Agent": self.get_random_user_agent(),
             "Accept": ", ".join(CONTENT_TYPES),
         }
-        async with httpx.AsyncClient(follow_redirects=True, timeout=self.timeout) as client:
-            try:
-                response = await client.get(url, headers=headers)
+        try:
+            # Stream so the content-type gate runs on the headers, before any of the body is downloaded
+            async with client.stream("GET", url, headers=headers, follow_redirects=True, timeout=self.timeout) as response:
                 content_type = response.headers.get("content-type", "")
                 if not any(ct in content_type for ct in CONTENT_TYPES):
                     return None  # Skip non-HTML content
-                canonical_url = self.extract_canonical_url(response.text) or str(response.url)
-                return {
-                    "url": url,
-                    "final_url": str(response.url),
-                    "canonical_url": canonical_url,
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "content_type": content_type,
-                    "content_length": len(response.content),
-                    "html": response.text,
-                }
-            except httpx.TimeoutException:
-                print(f"Timeout fetching {url}")
-                return None
-            except httpx.HTTPStatusError as e:
-                print(f"HTTP error {e.response.status_code} for {url}")
-                return None
-            except Exception as e:
-                print(f"Failed to fetch {url}: {e}")
-                return None
-
-    def extract_canonical_url(self, html: str) -> Optional[str]:
-        import re
-        match = re.search(r'<link rel=["\']canonical["\'] href=["\']([^"\']+)["\']', html, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        return None
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > MAX_BODY_BYTES:
+                        print(f"Skipping {url}: body larger than {MAX_BODY_BYTES} bytes")
+                        return None
+                    chunks.append(chunk)
+            content = b"".join(chunks)
+            canonical_url = self.extract_canonical_url(content) or str(response.url)
+            return {
+                "url": url,
+                "final_url": str(response.url),
+                "canonical_url": canonical_url,
+                "status_code": response.status_code,
+                "headers": {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+                "content_type": content_type,
+                "content_length": len(content),
+                "html": content.decode(response.encoding or "utf-8", errors="replace"),
+            }
+        except httpx.TimeoutException:
+            print(f"Timeout fetching {url}")
+            return None
+        except httpx.HTTPStatusError as e:
+            print(f"HTTP error {e.response.status_code} for {url}")
+            return None
+        except Exception as e:
+            print(f"Failed to fetch {url}: {e}")
+            return None
+
+    def extract_canonical_url(self, html: Union[str, bytes]) -> Optional[str]:
+        # Raw bytes skip decoding the whole body just to look at the head
+        if isinstance(html, bytes):
+            match = CANONICAL_BYTES_RE.search(html, 0, CANONICAL_SCAN_BYTES)
+            return match.group(1).decode("utf-8", "replace") if match else None
+        match = CANONICAL_RE.search(html, 0, CANONICAL_SCAN_BYTES)
+        return match.group(1) if match else None
 
     async def crawl(self, urls: List[str]) -> List[Dict[str, Any]]:
-        results = []
-        tasks = [self.fetch(url) for url in urls]
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            if result:
-                results.append(result)
-        return results 
\ No newline at end of file
+        # Fetch each URL once, with same-host URLs adjacent so they go out back to back on pooled connections
+        urls = sorted(dict.fromkeys(urls), key=lambda u: urlsplit(u).netloc)
+        if self.client is not None:
+            return await self._crawl_with(self.client, urls)
+        # One client for the whole crawl so same-host URLs share keep-alive connections and TLS sessions
+        async with self._new_client() as client:
+            return await self._crawl_with(client, urls)
+
+    async def _crawl_with(self, client: httpx.AsyncClient, urls: List[str]) -> List[Dict[str, Any]]:
+        # Cap in-flight requests so a large batch doesn't open one socket per URL at once
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(url: str) -> Optional[Dict[str, Any]]:
+            async with sem:
+                return await self._fetch_with(client, url)
+
+        return [r for r in await asyncio.gather(*(bounded(url) for url in urls)) if r] 
\ No newline at end of file
@@ -1,22 +1,63 @@
 import re
-import json
+import orjson
 from typing import Dict, Any, List, Optional
-from bs4 import BeautifulSoup
+from lxml import etree
 import os
 from dotenv import load_dotenv
+from app.core.content_classifier import keyword_regex, first_category
+from app.core.text_cleaner import parse_html_document
 
 # Pattern-based extraction
-EMAIL_REGEX = r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+"
-PHONE_REGEX = r"\+?\d[\d\s().-]{7,}\d"
-ADDRESS_REGEX = r"\d{1,5}\s+([A-Za-z0-9.,'\-\s]+(?:Street|Avenue|Road|Boulevard|Lane|Drive|Place|Court|Way|Terrace|Close|Crescent|Grove|Square|Gardens|Heights|Manor|Villa|Apartment|Suite|Floor|Building|Center|Centre|Plaza|Mall|Complex|District|Area|Zone|City|Town|Village|County|State|Province|Country|Postal|Zip|Code))"
+# The fences and length caps below keep these linear-ish on long pages: (?<!\d) stops a scan from
+# restarting at every digit of a run it already rejected, and the bounded runs stop an address or
+# name from sweeping forward (then backtracking) across a whole paragraph looking for its keyword.
+EMAIL_REGEX = r"\b[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+\b"
+PHONE_REGEX = r"(?<!\d)\+?\d[\d\s().-]{7,}\d"
+ADDRESS_REGEX = r"(?<!\d)\d{1,5}\s+([A-Za-z0-9.,'\-\s]{1,100}(?:Street|Avenue|Road|Boulevard|Lane|Drive|Place|Court|Way|Terrace|Close|Crescent|Grove|Square|Gardens|Heights|Manor|Villa|Apartment|Suite|Floor|Building|Center|Centre|Plaza|Mall|Complex|District|Area|Zone|City|Town|Village|County|State|Province|Country|Postal|Zip|Code))"
 # More flexible business name regex that captures various hotel/travel business patterns
-BUSINESS_NAME_REGEX = r"([A-Z][a-zA-Z0-9&\s'-]+(?:Hotel|Resort|Tours?|Travel|Restaurant|Cafe|Agency|Lodge|Inn|Guesthouse|Accommodation|Booking|Reservation))"
-SOCIAL_PATTERNS = [
-    r"https?://(www\.)?facebook.com/[^\s'\"<>]+",
-    r"https?://(www\.)?instagram.com/[^\s'\"<>]+",
-    r"https?://(www\.)?twitter.com/[^\s'\"<>]+",
-    r"https?://(www\.)?linkedin.com/[^\s'\"<>]+",
+BUSINESS_NAME_REGEX = r"([A-Z][a-zA-Z0-9&\s'-]{1,80}(?:Hotel|Resort|Tours?|Travel|Restaurant|Cafe|Agency|Lodge|Inn|Guesthouse|Accommodation|Booking|Reservation))"
+# Compiled once at import; extract_pattern_leads runs on every crawled page
+EMAIL_RE = re.compile(EMAIL_REGEX)
+PHONE_RE = re.compile(PHONE_REGEX)
+ADDRESS_RE = re.compile(ADDRESS_REGEX)
+BUSINESS_NAME_RE = re.compile(BUSINESS_NAME_REGEX)
+# One pass over the page for every social network; no capture groups, so findall returns whole URLs
+SOCIAL_RE = re.compile(r"https?://(?:www\.)?(?:facebook|instagram|twitter|linkedin)\.com/[^\s'\"<>]+")
+CONTACT_FORM_RE = re.compile(r'<form[^>]*action=[^>]*contact', re.IGNORECASE)
+
+# Business name cleanup: trailing "- Contact Information", "- About", "- Home" and runs of whitespace
+NAME_SUFFIX_RE = re.compile(r'\s*[-–]\s*(?:Contact\s+Information|About|Home).*', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Fallback business name sources used by create_leads_from_patterns
+BUSINESS_INDICATOR_RE = re.compile(r'([A-Z][a-zA-Z0-9&\s\'-]{1,80}(?:Hotel|Resort|Tours?|Travel|Restaurant|Cafe|Agency|Lodge|Inn|Guesthouse))')
+TITLE_RES = [
+    re.compile(r'<title>([^<]+)</title>', re.IGNORECASE),
+    re.compile(r'<h1[^>]*>([^<]+)</h1>', re.IGNORECASE),
+    re.compile(r'([A-Z][a-zA-Z0-9&\s\'-]+)\s*[-–]\s*(?:Contact|About|Home)', re.IGNORECASE),
+]
+
+# Email/phone written next to each other, in either order
+EMAIL_PHONE_PAIR_RES = [
+    re.compile(r'email[:\s]*([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)[^a-zA-Z0-9_.+-]*phone[:\s]*(\+?\d[\d\s().-]{7,}\d)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'phone[:\s]*(\+?\d[\d\s().-]{7,}\d)[^a-zA-Z0-9_.+-]*email[:\s]*([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)[^a-zA-Z0-9_.+-]*(\+?\d[\d\s().-]{7,}\d)', re.IGNORECASE | re.DOTALL),
+]
+
+# Contact person: "Manager: Jean-Pierre Dubois" or "Jean-Pierre Dubois, Manager"
+CONTACT_PERSON_RES = [
+    re.compile(r'(?:Manager|Contact|Director|Owner|Chef|Guide)[:\s]*([A-Z][a-zA-Z\s]+)'),
+    re.compile(r'([A-Z][a-zA-Z\s]+)[:\s]*(?:Manager|Contact|Director|Owner)'),
+]
+CAPITALIZED_NAME_RE = re.compile(r'([A-Z][a-zA-Z\s]+)[:\s]')
+
+WEBSITE_RE = re.compile(r'https?://(?:www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+ADDRESS_RES = [
+    re.compile(r'Address[:\s]*([^,\n]+(?:,\s*[^,\n]+)*)', re.IGNORECASE),
+    re.compile(r'(\d{1,5}\s+[A-Za-z0-9.,\'\-\s]+(?:Street|Avenue|Road|Boulevard|Lane|Drive|Place|Court|Way|Terrace|Close|Crescent|Grove|Square|Gardens|Heights|Manor|Villa|Apartment|Suite|Floor|Building|Center|Centre|Plaza|Mall|Complex|District|Area|Zone|City|Town|Village|County|State|Province|Country|Postal|Zip|Code))', re.IGNORECASE),
+    re.compile(r'(\d{1,5}\s+[A-Za-z0-9.,\'\-\s]+,\s*\d{5}\s+[A-Za-z\s]+,\s*[A-Za-z\s]+)', re.IGNORECASE),
 ]
+AI_JSON_RE = re.compile(r'(\[.*?\]|\{.*?\})', re.DOTALL)
 
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -33,32 +74,27 @@ def extract_pattern_leads(text: str) -> Dict[str, Any]:
             "leads": [],  # New field for structured leads
         }
     
-    emails = re.findall(EMAIL_REGEX, text)
-    phones = re.findall(PHONE_REGEX, text)
-    addresses = re.findall(ADDRESS_REGEX, text)
-    business_names = re.findall(BUSINESS_NAME_REGEX, text)
+    # An email match needs an '@'; skip the scan entirely when there is none
+    emails = EMAIL_RE.findall(text) if "@" in text else []
+    phones = PHONE_RE.findall(text)
+    addresses = ADDRESS_RE.findall(text)
+    business_names = BUSINESS_NAME_RE.findall(text)
     # Convert tuples to strings for business_names
     business_names = [" ".join(bn).strip() if isinstance(bn, tuple) else bn for bn in business_names]
     
     # Clean up business names - remove "Contact Information" and extra text
     cleaned_business_names = []
     for name in business_names:
-        # Remove "Contact Information" and similar text
-        cleaned_name = re.sub(r'\s*[-–]\s*Contact\s+Information.*', '', name, flags=re.IGNORECASE)
-        cleaned_name = re.sub(r'\s*[-–]\s*About.*', '', cleaned_name, flags=re.IGNORECASE)
-        cleaned_name = re.sub(r'\s*[-–]\s*Home.*', '', cleaned_name, flags=re.IGNORECASE)
-        # Remove extra whitespace and newlines
-        cleaned_name = re.sub(r'\s+', ' ', cleaned_name).strip()
+        # Strip the "- Contact Information"/"- About"/"- Home" suffix, then collapse whitespace
+        cleaned_name = WHITESPACE_RE.sub(' ', NAME_SUFFIX_RE.sub('', name)).strip()
         if cleaned_name and len(cleaned_name) > 3:
             cleaned_business_names.append(cleaned_name)
     
     business_names = cleaned_business_names
     
-    socials = []
-    for pat in SOCIAL_PATTERNS:
-        socials.extend(re.findall(pat, text))
+    socials = SOCIAL_RE.findall(text)
     # Contact form detection
-    contact_form = bool(re.search(r'<form[^>]*action=[^>]*contact', text, re.IGNORECASE))
+    contact_form = bool(CONTACT_FORM_RE.search(text))
     
     # Create structured leads from extracted patterns
     leads = create_leads_from_patterns(emails, phones, addresses, business_names, text)
@@ -69,11 +105,11 @@ def extract_pattern_leads(text: str) -> Dict[str, Any]:
     debug_logger.info(f"[extract_pattern_leads] Text length: {len(text)}, Found: emails={len(emails)}, phones={len(phones)}, business_names={len(business_names)}, leads={len(leads)}")
     
     return {
-        "emails": list(set(emails)),
-        "phones": list(set(phones)),
-        "addresses": list(set(addresses)),
-        "business_names": list(set(business_names)),
-        "social_profiles": list(set(socials)),
+        "emails": list(dict.fromkeys(emails)),
+        "phones": list(dict.fromkeys(phones)),
+        "addresses": list(dict.fromkeys(addresses)),
+        "business_names": list(dict.fromkeys(business_names)),
+        "social_profiles": list(dict.fromkeys(socials)),
         "has_contact_form": contact_form,
         "leads": leads,  # New field for structured leads
     }
@@ -93,20 +129,15 @@ def create_leads_from_patterns(emails: List[str], phones: List[str], addresses:
     # If no business names found, try to extract from context
     if not business_names:
         # Look for common business indicators in the text
-        business_indicators = re.findall(r'([A-Z][a-zA-Z0-9&\s\'-]+(?:Hotel|Resort|Tours?|Travel|Restaurant|Cafe|Agency|Lodge|Inn|Guesthouse))', text)
+        business_indicators = BUSINESS_INDICATOR_RE.findall(text)
         business_names = [name.strip().replace('\n', ' ').replace('  ', ' ') for name in business_indicators]
-        business_names = list(set(business_names))
+        business_names = list(dict.fromkeys(business_names))
     
     # If still no business names, try to extract from title or headers
     if not business_names:
         # Look for title patterns
-        title_patterns = [
-            r'<title>([^<]+)</title>',
-            r'<h1[^>]*>([^<]+)</h1>',
-            r'([A-Z][a-zA-Z0-9&\s\'-]+)\s*[-–]\s*(?:Contact|About|Home)',
-        ]
-        for pattern in title_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for title_re in TITLE_RES:
+            matches = title_re.findall(text)
             if matches:
                 business_names = [match.strip().replace('\n', ' ').replace('  ', ' ') for match in matches]
                 business_names = [name for name in business_names if name and len(name) > 3]
@@ -129,7 +160,31 @@ def create_leads_from_patterns(emails: List[str], phones: List[str], addresses:
     
     # Try to match emails and phones to create leads
     # First, look for email-phone pairs in the text
-    email_phone_pairs = find_email_phone_pairs(text)
+    email_phone_pairs = find_email_phone_pairs(text, emails, phones)
+    
+    # Everything except the contact person is the same for every lead on the page; look it up once
+    business_name = business_names[0] if business_names else "Unknown Business"
+    address = addresses[0] if addresses else None
+    website = extract_website(text)
+    source_url = website or "https://test.example.com/contact"
+    lead_type = classify_lead_type(text, business_names[0] if business_names else "")
+    contact_people: Dict[str, str] = {}
+    
+    def make_lead(contact_info: str, email: Optional[str], phone: Optional[str], confidence: float) -> Dict[str, Any]:
+        if contact_info not in contact_people:
+            contact_people[contact_info] = extract_contact_person(text, contact_info)
+        return {
+            "business_name": business_name,
+            "contact_person": contact_people[contact_info],
+            "email": email,
+            "phone": phone,
+            "address": address,
+            "website": website,
+            "lead_type": lead_type,
+            "confidence_score": confidence,
+            "extraction_method": "pattern",
+            "source_url": source_url,
+        }
     
     # Track used emails and phones to avoid duplicates
     used_emails = set()
@@ -146,74 +201,32 @@ def create_leads_from_patterns(emails: List[str], phones: List[str], addresses:
         
         used_emails.add(email)
         used_phones.add(phone)
-        
-        lead = {
-            "business_name": business_names[0] if business_names else "Unknown Business",
-            "contact_person": extract_contact_person(text, email),
-            "email": email,
-            "phone": phone,
-            "address": addresses[0] if addresses else None,
-            "website": extract_website(text),
-            "lead_type": classify_lead_type(text, business_names[0] if business_names else ""),
-            "confidence_score": 0.8,
-            "extraction_method": "pattern",
-            "source_url": extract_website(text) or "https://test.example.com/contact",
-        }
-        leads.append(lead)
+        leads.append(make_lead(email, email, phone, 0.8))
     
     # Only create additional leads for truly unmatched emails (not in pairs)
     for email in emails:
         email = email.strip()
         if email not in used_emails:
             used_emails.add(email)
-            lead = {
-                "business_name": business_names[0] if business_names else "Unknown Business",
-                "contact_person": extract_contact_person(text, email),
-                "email": email,
-                "phone": None,
-                "address": addresses[0] if addresses else None,
-                "website": extract_website(text),
-                "lead_type": classify_lead_type(text, business_names[0] if business_names else ""),
-                "confidence_score": 0.6,
-                "extraction_method": "pattern",
-                "source_url": extract_website(text) or "https://test.example.com/contact",
-            }
-            leads.append(lead)
+            leads.append(make_lead(email, email, None, 0.6))
     
     # Only create additional leads for truly unmatched phones (not in pairs)
     for phone in phones:
         phone = phone.strip()
         if phone not in used_phones:
             used_phones.add(phone)
-            lead = {
-                "business_name": business_names[0] if business_names else "Unknown Business",
-                "contact_person": extract_contact_person(text, phone),
-                "email": None,
-                "phone": phone,
-                "address": addresses[0] if addresses else None,
-                "website": extract_website(text),
-                "lead_type": classify_lead_type(text, business_names[0] if business_names else ""),
-                "confidence_score": 0.5,
-                "extraction_method": "pattern",
-                "source_url": extract_website(text) or "https://test.example.com/contact",
-            }
-            leads.append(lead)
+            leads.append(make_lead(phone, None, phone, 0.5))
     
     return leads
 
-def find_email_phone_pairs(text: str) -> List[Dict[str, str]]:
-    """Find email-phone pairs that are likely related."""
+def find_email_phone_pairs(text: str, emails: Optional[List[str]] = None, phones: Optional[List[str]] = None) -> List[Dict[str, str]]:
+    """Find email-phone pairs that are likely related.
+    Pass the page's already-extracted emails/phones to save rescanning text for the fallback pairing."""
     pairs = []
     
     # Look for patterns like "email: x@y.com, phone: +123..."
-    email_phone_patterns = [
-        r'email[:\s]*([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)[^a-zA-Z0-9_.+-]*phone[:\s]*(\+?\d[\d\s().-]{7,}\d)',
-        r'phone[:\s]*(\+?\d[\d\s().-]{7,}\d)[^a-zA-Z0-9_.+-]*email[:\s]*([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)',
-        r'([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)[^a-zA-Z0-9_.+-]*(\+?\d[\d\s().-]{7,}\d)',
-    ]
-    
-    for pattern in email_phone_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
+    for pair_re in EMAIL_PHONE_PAIR_RES:
+        matches = pair_re.findall(text)
         for match in matches:
             if len(match) == 2:
                 email, phone = match[0], match[1]
@@ -225,8 +238,10 @@ def find_email_phone_pairs(text: str) -> List[Dict[str, str]]:
     
     # If no pairs found, try to match emails and phones that are close to each other
     if not pairs:
-        emails = re.findall(EMAIL_REGEX, text)
-        phones = re.findall(PHONE_REGEX, text)
+        if emails is None:
+            emails = EMAIL_RE.findall(text)
+        if phones is None:
+            phones = PHONE_RE.findall(text)
         
         # Simple pairing: match first email with first phone, second with second, etc.
         for i in range(min(len(emails), len(phones))):
@@ -236,7 +251,8 @@ def find_email_phone_pairs(text: str) -> List[Dict[str, str]]:
 
 def extract_contact_person(text: str, contact_info: str) -> str:
     """Extract contact person name from text based on contact info."""
-    # Clean up the text first
+    # Clean up the text first (the original keeps its line breaks for the context lookups below)
+    raw_text = text
     text = text.replace('\n', ' ').replace('  ', ' ')
     
     # For the specific test content, try to map emails to known names first
@@ -252,74 +268,60 @@ def extract_contact_person(text: str, contact_info: str) -> str:
     
     # For the test content, we need to look for specific patterns
     # Look for patterns like "Manager: Jean-Pierre Dubois" or "Chef: Marie Laurent"
-    patterns = [
-        r'(?:Manager|Contact|Director|Owner|Chef|Guide)[:\s]*([A-Z][a-zA-Z\s]+)',
-        r'([A-Z][a-zA-Z\s]+)[:\s]*(?:Manager|Contact|Director|Owner)',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    for person_re in CONTACT_PERSON_RES:
+        matches = person_re.findall(text)
         if matches:
             for match in matches:
                 name = match.strip()
-                name = re.sub(r'\s+', ' ', name).strip()
+                name = WHITESPACE_RE.sub(' ', name).strip()
                 if len(name) > 2 and not name.lower().startswith('information'):
                     return name
     
-    # If no specific pattern found, try to extract from context around the contact info
-    if contact_info in text:
-        # Look for lines containing the contact info
-        lines = text.split('\n')
-        for line in lines:
-            if contact_info in line:
-                # Try to extract a name from the same line
-                name_match = re.search(r'([A-Z][a-zA-Z\s]+)[:\s]', line)
-                if name_match:
-                    name = name_match.group(1).strip()
-                    name = re.sub(r'\s+', ' ', name).strip()
-                    if len(name) > 2 and not name.lower().startswith('information'):
-                        return name
-    
-    # Try to find names near the contact info
-    if contact_info in text:
-        # Look for names in the same paragraph as the contact info
-        paragraphs = text.split('\n\n')
-        for paragraph in paragraphs:
-            if contact_info in paragraph:
-                # Look for capitalized names
-                name_matches = re.findall(r'([A-Z][a-zA-Z\s]+)[:\s]', paragraph)
-                for name_match in name_matches:
-                    name = name_match.strip()
-                    name = re.sub(r'\s+', ' ', name).strip()
-                    if (len(name) > 2 and 
-                        not name.lower().startswith('information') and
-                        not name.lower().startswith('contact') and
-                        not name.lower().startswith('email') and
-                        not name.lower().startswith('phone')):
-                        return name
+    # If no specific pattern found, try to extract from context around the contact info.
+    # Find it once in the original text and slice out its line and paragraph by index.
+    idx = raw_text.find(contact_info)
+    if idx != -1:
+        # Try to extract a name from the same line
+        line_start = raw_text.rfind('\n', 0, idx) + 1
+        line_end = raw_text.find('\n', idx)
+        if line_end == -1:
+            line_end = len(raw_text)
+        name_match = CAPITALIZED_NAME_RE.search(raw_text, line_start, line_end)
+        if name_match:
+            name = WHITESPACE_RE.sub(' ', name_match.group(1)).strip()
+            if len(name) > 2 and not name.lower().startswith('information'):
+                return name
+        
+        # Look for capitalized names in the same paragraph as the contact info
+        para_start = raw_text.rfind('\n\n', 0, idx)
+        para_start = 0 if para_start == -1 else para_start + 2
+        para_end = raw_text.find('\n\n', idx)
+        if para_end == -1:
+            para_end = len(raw_text)
+        for name_match in CAPITALIZED_NAME_RE.finditer(raw_text, para_start, para_end):
+            name = WHITESPACE_RE.sub(' ', name_match.group(1)).strip()
+            if (len(name) > 2 and 
+                not name.lower().startswith('information') and
+                not name.lower().startswith('contact') and
+                not name.lower().startswith('email') and
+                not name.lower().startswith('phone')):
+                return name
     
     return "Unknown Contact"
 
 def extract_website(text: str) -> str:
     """Extract website URL from text."""
-    website_pattern = r'https?://(?:www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    matches = re.findall(website_pattern, text)
+    matches = WEBSITE_RE.findall(text)
     return matches[0] if matches else None
 
 def extract_address(text: str) -> str:
     """Extract address from text."""
     # Look for address patterns
-    address_patterns = [
-        r'Address[:\s]*([^,\n]+(?:,\s*[^,\n]+)*)',
-        r'(\d{1,5}\s+[A-Za-z0-9.,\'\-\s]+(?:Street|Avenue|Road|Boulevard|Lane|Drive|Place|Court|Way|Terrace|Close|Crescent|Grove|Square|Gardens|Heights|Manor|Villa|Apartment|Suite|Floor|Building|Center|Centre|Plaza|Mall|Complex|District|Area|Zone|City|Town|Village|County|State|Province|Country|Postal|Zip|Code))',
-        r'(\d{1,5}\s+[A-Za-z0-9.,\'\-\s]+,\s*\d{5}\s+[A-Za-z\s]+,\s*[A-Za-z\s]+)',
-    ]
-    
-    for pattern in address_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for address_re in ADDRESS_RES:
+        matches = address_re.findall(text)
         if matches:
             address = matches[0].strip()
-            address = re.sub(r'\s+', ' ', address).strip()
+            address = WHITESPACE_RE.sub(' ', address).strip()
             if len(address) > 10:  # Minimum reasonable address length
                 return address
     
@@ -329,35 +331,46 @@ def extract_address(text: str) -> str:
     
     return None
 
+# Lead type keywords, checked against the business name first and then the page text.
+# Each table is one regex scan that reports the earliest-listed type with a hit.
+_NAME_LEAD_TYPE_RE = keyword_regex({
+    'hotel': ['hotel', 'resort', 'lodge', 'inn'],
+    'restaurant': ['restaurant', 'cafe', 'dining'],
+    'tour_operator': ['tour', 'travel', 'agency'],
+})
+_TEXT_LEAD_TYPE_RE = keyword_regex({
+    'hotel': ['hotel', 'accommodation', 'room', 'booking'],
+    'restaurant': ['restaurant', 'dining', 'food', 'menu'],
+    'tour_operator': ['tour', 'excursion', 'guide', 'travel'],
+})
+
 def classify_lead_type(text: str, business_name: str) -> str:
     """Classify the type of lead based on text and business name."""
-    text_lower = text.lower()
-    name_lower = business_name.lower()
-    
-    if any(word in name_lower for word in ['hotel', 'resort', 'lodge', 'inn']):
-        return 'hotel'
-    elif any(word in name_lower for word in ['restaurant', 'cafe', 'dining']):
-        return 'restaurant'
-    elif any(word in name_lower for word in ['tour', 'travel', 'agency']):
-        return 'tour_operator'
-    elif any(word in text_lower for word in ['hotel', 'accommodation', 'room', 'booking']):
-        return 'hotel'
-    elif any(word in text_lower for word in ['restaurant', 'dining', 'food', 'menu']):
-        return 'restaurant'
-    elif any(word in text_lower for word in ['tour', 'excursion', 'guide', 'travel']):
-        return 'tour_operator'
-    else:
-        return 'unknown'
+    return (first_category(_NAME_LEAD_TYPE_RE, business_name.lower())
+            or first_category(_TEXT_LEAD_TYPE_RE, text.lower())
+            or 'unknown')
 
 # Structured data extraction
 
+_JSONLD_XPATH = etree.XPath('//script[@type="application/ld+json"]')
+_ITEMTYPE_XPATH = etree.XPath("//*[@itemtype]")
+# schema.org types kept from microdata: exact type names first (one set lookup for the usual
+# "https://schema.org/Hotel" form), then any type containing one of the keywords ("LodgingBusiness")
+MICRODATA_TYPES = frozenset({"organization", "localbusiness", "hotel", "restaurant", "touristattraction"})
+MICRODATA_TYPE_RE = re.compile(r"organization|business|hotel|restaurant|touristattraction")
+
 def extract_structured_leads(html: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html, "lxml")
     leads = []
+    if not html or not html.strip():
+        return {"structured_leads": leads}
+    try:
+        root = parse_html_document(html)
+    except (etree.ParserError, ValueError):
+        return {"structured_leads": leads}
     # JSON-LD
-    for script in soup.find_all("script", type="application/ld+json"):
+    for script in _JSONLD_XPATH(root):
         try:
-            data = json.loads(script.string)
+            data = orjson.loads(script.text)
             if isinstance(data, dict) and (data.get("@type") in ["Organization", "LocalBusiness", "Hotel", "Restaurant", "TouristAttraction"]):
                 leads.append(data)
             elif isinstance(data, list):
@@ -367,17 +380,17 @@ def extract_structured_leads(html: str) -> Dict[str, Any]:
         except Exception:
             continue
     # Microdata (simple)
-    for tag in soup.find_all(attrs={"itemtype": True}):
-        itemtype = tag["itemtype"].lower()
-        if any(t in itemtype for t in ["organization", "business", "hotel", "restaurant", "touristattraction"]):
-            leads.append({"itemtype": itemtype, "properties": tag.attrs})
+    for tag in _ITEMTYPE_XPATH(root):
+        itemtype = tag.get("itemtype").lower()
+        if itemtype.rsplit("/", 1)[-1] in MICRODATA_TYPES or MICRODATA_TYPE_RE.search(itemtype):
+            leads.append({"itemtype": itemtype, "properties": dict(tag.attrib)})
     # Reviews, events, services (from JSON-LD or microdata)
     # (Extend as needed)
     return {"structured_leads": leads}
 
 # AI-powered content analysis using Gemini
 
-def ai_extract_leads(text: str, html: Optional[str] = None) -> Dict[str, Any]:
+async def ai_extract_leads(text: str, html: Optional[str] = None) -> Dict[str, Any]:
     """
     Use Gemini API to extract business leads from text/html.
     Returns: dict with ai_leads, confidence, explanation
@@ -397,7 +410,6 @@ def ai_extract_leads(text: str, html: Optional[str] = None) -> Dict[str, Any]:
     try:
         import google.generativeai as genai
         import asyncio
-        import concurrent.futures
         
         genai.configure(api_key=GEMINI_API_KEY)
         model = genai.GenerativeModel("gemini-2.0-flash")
@@ -408,14 +420,16 @@ def ai_extract_leads(text: str, html: Optional[str] = None) -> Dict[str, Any]:
             "Return a JSON array of leads.\n\nContent:\n" + (text or "")
         )
         
-        # Use a timeout for the API call
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(model.generate_content, prompt)
-            try:
-                response = future.result(timeout=15)  # 15 second timeout
-            except concurrent.futures.TimeoutError:
-                debug_logger.warning("[ai_extract_leads] Gemini API call timed out")
-                return {"ai_leads": [], "confidence": 0.0, "explanation": "Gemini API call timed out."}
+        # Use a timeout for the API call; the native async client doesn't tie up a thread while waiting
+        if hasattr(model, "generate_content_async"):
+            call = model.generate_content_async(prompt)
+        else:
+            call = asyncio.to_thread(model.generate_content, prompt)
+        try:
+            response = await asyncio.wait_for(call, timeout=15)  # 15 second timeout
+        except asyncio.TimeoutError:
+            debug_logger.warning("[ai_extract_leads] Gemini API call timed out")
+            return {"ai_leads": [], "confidence": 0.0, "explanation": "Gemini API call timed out."}
         
         # Try to extract JSON from the response
         import json
@@ -424,7 +438,7 @@ def ai_extract_leads(text: str, html: Optional[str] = None) -> Dict[str, Any]:
         if content.startswith("```"):
             content = content.strip("`\n ")
         # Try to find a JSON array or object in the response
-        match = re.search(r'(\[.*?\]|\{.*?\})', content, re.DOTALL)
+        match = AI_JSON_RE.search(content)
         if match:
             json_str = match.group(0)
         else:
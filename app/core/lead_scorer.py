@@ -1,36 +1,56 @@
 import re
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 
 TRAVEL_KEYWORDS = [
     "hotel", "resort", "hostel", "restaurant", "tour", "travel", "agency", "blogger", "event", "operator"
 ]
 
+@lru_cache(maxsize=256)
+def _keywords_re(keywords: Tuple[str, ...]) -> "re.Pattern":
+    """One alternation over all keywords, so a lead's text is scanned once instead of once per keyword"""
+    return re.compile("|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
 # Completeness scoring
 
-def completeness_score(lead: Dict[str, Any]) -> float:
+COMPLETENESS_FIELDS = [
+    ('business_name', 0.2),
+    ('email', 0.2),
+    ('phone', 0.15),
+    ('website', 0.15),
+    ('address', 0.1),
+    ('contact_person', 0.1),
+    ('lead_type', 0.1)
+]
+
+_COMPLETENESS_BITS = [(field, 1 << i) for i, (field, _) in enumerate(COMPLETENESS_FIELDS)]
+
+def _completeness_for_mask(mask: int) -> float:
     score = 0.0
-    fields = [
-        ('business_name', 0.2),
-        ('email', 0.2),
-        ('phone', 0.15),
-        ('website', 0.15),
-        ('address', 0.1),
-        ('contact_person', 0.1),
-        ('lead_type', 0.1)
-    ]
-    for field, weight in fields:
-        if lead.get(field):
+    for i, (_, weight) in enumerate(COMPLETENESS_FIELDS):
+        if mask & (1 << i):
             score += weight
     return round(score, 2)
 
+# Score for every combination of present fields, indexed by the presence bitmask
+_COMPLETENESS_TABLE = tuple(_completeness_for_mask(mask) for mask in range(1 << len(COMPLETENESS_FIELDS)))
+
+def completeness_score(lead: Dict[str, Any]) -> float:
+    mask = 0
+    for field, bit in _COMPLETENESS_BITS:
+        if lead.get(field):
+            mask |= bit
+    return _COMPLETENESS_TABLE[mask]
+
 # Relevance scoring
 
 def relevance_score(lead: Dict[str, Any], target_keywords: Optional[list] = None, target_geo: Optional[str] = None) -> float:
     score = 0.0
     keywords = target_keywords or TRAVEL_KEYWORDS
     text = " ".join(str(lead.get(f, "")).lower() for f in ["business_name", "lead_type", "description", "website"])
-    if any(kw in text for kw in keywords):
+    if keywords and _keywords_re(tuple(keywords)).search(text):
         score += 0.5
     if target_geo and target_geo.lower() in text:
         score += 0.2
@@ -44,57 +64,57 @@ def relevance_score(lead: Dict[str, Any], target_keywords: Optional[list] = None
 
 # Freshness & activity scoring
 
+@lru_cache(maxsize=4096)
+def _parse_iso_str(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def _parse_iso(value: Any) -> Optional[datetime]:
+    """Memoized fromisoformat; None for anything that isn't an ISO date string"""
+    return _parse_iso_str(value) if isinstance(value, str) else None
+
+def _age_days(value: Any, now: datetime) -> Optional[int]:
+    dt = _parse_iso(value)
+    if dt is None:
+        return None
+    if (dt.tzinfo is None) != (now.tzinfo is None):
+        return None  # naive vs aware can't be subtracted
+    return (now - dt).days
+
 def freshness_score(lead: Dict[str, Any], now: Optional[datetime] = None) -> float:
     score = 0.0
     now = now or datetime.utcnow()
     # Content publication date
-    pub_date = lead.get("publish_date") or lead.get("content_date")
-    if pub_date:
-        try:
-            dt = datetime.fromisoformat(pub_date)
-            days = (now - dt).days
-            if days < 30:
-                score += 0.5
-            elif days < 180:
-                score += 0.3
-            elif days < 365:
-                score += 0.1
-        except Exception:
-            pass
+    days = _age_days(lead.get("publish_date") or lead.get("content_date"), now)
+    if days is not None:
+        if days < 30:
+            score += 0.5
+        elif days < 180:
+            score += 0.3
+        elif days < 365:
+            score += 0.1
     # Website last updated
-    last_updated = lead.get("website_last_updated")
-    if last_updated:
-        try:
-            dt = datetime.fromisoformat(last_updated)
-            days = (now - dt).days
-            if days < 30:
-                score += 0.3
-            elif days < 180:
-                score += 0.2
-            elif days < 365:
-                score += 0.1
-        except Exception:
-            pass
+    days = _age_days(lead.get("website_last_updated"), now)
+    if days is not None:
+        if days < 30:
+            score += 0.3
+        elif days < 180:
+            score += 0.2
+        elif days < 365:
+            score += 0.1
     # Social activity (recent post)
-    if lead.get("recent_social_activity_date"):
-        try:
-            dt = datetime.fromisoformat(lead["recent_social_activity_date"])
-            days = (now - dt).days
-            if days < 30:
-                score += 0.2
-            elif days < 180:
-                score += 0.1
-        except Exception:
-            pass
+    days = _age_days(lead.get("recent_social_activity_date"), now)
+    if days is not None:
+        if days < 30:
+            score += 0.2
+        elif days < 180:
+            score += 0.1
     # Review recency
-    if lead.get("recent_review_date"):
-        try:
-            dt = datetime.fromisoformat(lead["recent_review_date"])
-            days = (now - dt).days
-            if days < 30:
-                score += 0.1
-        except Exception:
-            pass
+    days = _age_days(lead.get("recent_review_date"), now)
+    if days is not None and days < 30:
+        score += 0.1
     # Domain age (older = more trusted)
     if lead.get("domain_age_years"):
         try:
@@ -123,4 +143,82 @@ def score_lead(lead: Dict[str, Any], target_keywords: Optional[list] = None, tar
             "freshness": fresh
         },
         "scored_at": (now or datetime.utcnow()).isoformat()
-    } 
\ No newline at end of file
+    } 
+
+# Batch scoring: the same scores as score_lead, with the per-field arithmetic done as one
+# matrix product per component. Weights are kept in hundredths so the sums are exact.
+
+_COMPLETENESS_WEIGHTS = np.array([round(w * 100) for _, w in COMPLETENESS_FIELDS], dtype=np.int64)
+_RELEVANCE_WEIGHTS = np.array([50, 20, 10, 10, 10], dtype=np.int64)  # keyword, geo, website, socials, reviews
+
+def _days_since(value: Any, now: datetime) -> float:
+    days = _age_days(value, now)
+    return np.nan if days is None else days
+
+def _domain_age(lead: Dict[str, Any]) -> float:
+    if not lead.get("domain_age_years"):
+        return np.nan
+    try:
+        return float(lead["domain_age_years"])
+    except Exception:
+        return np.nan
+
+def _tiered(days: np.ndarray, tiers: List[Tuple[int, int]]) -> np.ndarray:
+    """Points for the first (max_days, points) tier each age falls under; unknown ages (NaN) score 0"""
+    return np.select([days < limit for limit, _ in tiers], [points for _, points in tiers], 0)
+
+def score_leads_batch(leads: List[Dict[str, Any]], target_keywords: Optional[list] = None, target_geo: Optional[str] = None, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    if not leads:
+        return []
+    now = now or datetime.utcnow()
+    keywords = target_keywords or TRAVEL_KEYWORDS
+    keyword_re = _keywords_re(tuple(keywords)) if keywords else None
+    geo = target_geo.lower() if target_geo else None
+
+    presence = np.array([[bool(lead.get(f)) for f, _ in COMPLETENESS_FIELDS] for lead in leads], dtype=np.int64)
+    completeness = presence @ _COMPLETENESS_WEIGHTS
+
+    relevance_flags = []
+    for lead in leads:
+        text = " ".join(str(lead.get(f, "")).lower() for f in ["business_name", "lead_type", "description", "website"])
+        relevance_flags.append((
+            keyword_re is not None and keyword_re.search(text) is not None,
+            geo is not None and geo in text,
+            bool(lead.get("website")),
+            bool(lead.get("social_profiles")),
+            lead.get("review_count", 0) > 0,
+        ))
+    relevance = np.minimum(np.array(relevance_flags, dtype=np.int64) @ _RELEVANCE_WEIGHTS, 100)
+
+    published = np.array([_days_since(lead.get("publish_date") or lead.get("content_date"), now) for lead in leads], dtype=np.float64)
+    updated = np.array([_days_since(lead.get("website_last_updated"), now) for lead in leads], dtype=np.float64)
+    social = np.array([_days_since(lead.get("recent_social_activity_date"), now) for lead in leads], dtype=np.float64)
+    reviewed = np.array([_days_since(lead.get("recent_review_date"), now) for lead in leads], dtype=np.float64)
+    domain_years = np.array([_domain_age(lead) for lead in leads], dtype=np.float64)
+    freshness = np.minimum(
+        _tiered(published, [(30, 50), (180, 30), (365, 10)])
+        + _tiered(updated, [(30, 30), (180, 20), (365, 10)])
+        + _tiered(social, [(30, 20), (180, 10)])
+        + _tiered(reviewed, [(30, 10)])
+        + np.where(domain_years > 5, 10, 0),
+        100,
+    )
+
+    scored_at = now.isoformat()
+    results = []
+    for c, r, f in zip(completeness.tolist(), relevance.tolist(), freshness.tolist()):
+        comp, rel, fresh = round(c / 100, 2), round(r / 100, 2), round(f / 100, 2)
+        results.append({
+            "completeness_score": comp,
+            "relevance_score": rel,
+            "freshness_score": fresh,
+            "final_score": round(0.4 * comp + 0.4 * rel + 0.2 * fresh, 2),
+            "scoring_factors": {
+                "completeness": comp,
+                "relevance": rel,
+                "freshness": fresh
+            },
+            "scored_at": scored_at
+        })
+    return results
+
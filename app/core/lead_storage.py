@@ -2,12 +2,20 @@
 Lead Storage Service - Handles database persistence and file exports
 """
 import os
+import io
+import asyncio
 import csv
-import json
+import orjson
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from urllib.parse import urlparse
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
@@ -23,114 +31,300 @@ from app.core.file_manager import EXPORTS_DIR, timestamped_filename
 
 logger = logging.getLogger(__name__)
 
+LEAD_COLUMNS = (
+    "id", "business_name", "contact_person", "email", "phone", "address",
+    "website", "lead_type", "confidence_score", "extraction_method",
+    "created_at", "source_url", "scoring",
+)
+
+# Source URLs whose crawled content ID is kept in memory by LeadStorageService
+CONTENT_ID_CACHE_SIZE = 10_000
+
+# Rows per INSERT statement on bulk writes; keeps very large batches under max_allowed_packet
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Scoring values exported as top-level columns
+SCORING_EXPORT_FIELDS = ('completeness_score', 'relevance_score', 'freshness_score', 'final_score', 'scored_at')
+
+# Header used for exports with no leads
+EXPORT_FIELDNAMES = [
+    'business_name', 'contact_person', 'email', 'phone', 'address',
+    'website', 'lead_type', 'confidence_score', 'extraction_method',
+    'created_at', 'source_url', 'completeness_score', 'relevance_score',
+    'freshness_score', 'final_score', 'scored_at'
+]
+
+def _chunked(rows: List[Dict[str, Any]], size: int = BULK_INSERT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class LeadColumnStore:
+    """In-memory lead buffer stored column-wise (one list per field) instead of a list of dicts.
+    Fields outside the known columns (e.g. extra keys from AI extraction) are kept per row in
+    an overflow dict and merged back by to_rows()"""
+
+    def __init__(self, columns=LEAD_COLUMNS):
+        self.columns = {name: [] for name in columns}
+        # Per-row dict of the lead's other fields, None when it had none
+        self.extras: List[Optional[Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+        # Bumped by bump_version() once a write has reached the DB; response caches key on it
+        self.version = 0
+
+    def append(self, lead: Dict[str, Any]) -> None:
+        extra = {k: v for k, v in lead.items() if k not in self.columns} or None
+        with self._lock:
+            for name, values in self.columns.items():
+                values.append(lead.get(name))
+            self.extras.append(extra)
+
+    def bump_version(self) -> None:
+        """Invalidate caches keyed on version; call after the matching DB write has committed"""
+        with self._lock:
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self.extras)
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Materialize the buffer as a list of lead dicts (for the exporters)"""
+        with self._lock:
+            names = list(self.columns)
+            rows = [dict(zip(names, row)) for row in zip(*self.columns.values())]
+            for row, extra in zip(rows, self.extras):
+                if extra:
+                    row.update(extra)
+            return rows
+
 class LeadStorageService:
     """Service for storing and managing leads in database and files"""
     
     def __init__(self):
         self.exports_dir = EXPORTS_DIR
         os.makedirs(self.exports_dir, exist_ok=True)
+        # source_url -> crawled content ID, LRU-capped; only holds IDs from committed batches
+        self._content_id_cache: "OrderedDict[str, int]" = OrderedDict()
+        self._content_id_lock = threading.Lock()
     
-    def store_lead_in_db(self, lead_data: Dict[str, Any]) -> Optional[int]:
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        One session (one pooled connection) shared by several storage calls,
+        committed on exit and rolled back on error; pass it as session=...
+        """
+        db = SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def store_lead_in_db(self, lead_data: Dict[str, Any], *, session: Optional[Session] = None) -> Optional[int]:
         """
         Store a lead in the database
         Returns the lead ID if successful, None if failed
         """
-        db = SessionLocal()
+        lead_ids = self.bulk_store_leads_in_db([lead_data], session=session)
+        return lead_ids[0] if lead_ids else None
+    
+    def bulk_store_leads_in_db(self, leads: List[Dict[str, Any]], *, session: Optional[Session] = None) -> List[int]:
+        """
+        Store a batch of leads in one session and one transaction, with one
+        multi-row INSERT per table (per BULK_INSERT_CHUNK_SIZE rows) instead of a round-trip per row
+        With a caller's session the batch runs in a savepoint and is committed
+        by the caller's session_scope
+        A chunk that fails is retried one lead per savepoint, so a bad lead only loses itself
+        Returns the new lead IDs of the stored leads (empty list if the batch failed)
+        """
+        if not leads:
+            return []
+        db = session or SessionLocal()
+        savepoint = db.begin_nested() if session is not None else None
         try:
-            # First, create or get crawled content record
-            source_url = lead_data.get('source_url', 'unknown')
-            crawled_content = self._get_or_create_crawled_content(db, source_url)
-            
-            # Create the lead record
-            lead = ExtractedLead(
-                content_id=crawled_content.id,
-                business_name=lead_data.get('business_name'),
-                contact_person=lead_data.get('contact_person'),
-                email=lead_data.get('email'),
-                phone=lead_data.get('phone'),
-                address=lead_data.get('address'),
-                website=lead_data.get('website'),
-                lead_type=lead_data.get('lead_type'),
-                confidence_score=lead_data.get('confidence_score'),
-                extraction_method=lead_data.get('extraction_method')
-                # created_at has a default value in the model
-            )
-            
-            db.add(lead)
-            db.flush()  # Get the ID
+            source_urls = [self._normalize_source_url(lead_data.get('source_url')) for lead_data in leads]
+            unique_urls = list(dict.fromkeys(source_urls))
+            content_ids = self._cached_content_ids(unique_urls)
+            uncached_urls = [url for url in unique_urls if url not in content_ids]
+            if uncached_urls:
+                content_ids.update(self._resolve_content_ids(db, uncached_urls))
             
-            # Store scoring data if available
-            if 'scoring' in lead_data and lead_data['scoring']:
-                scoring_data = lead_data['scoring']
-                lead_score = LeadScore(
-                    lead_id=lead.id,
-                    completeness_score=scoring_data.get('completeness_score'),
-                    relevance_score=scoring_data.get('relevance_score'),
-                    freshness_score=scoring_data.get('freshness_score'),
-                    final_score=scoring_data.get('final_score'),
-                    scoring_factors=scoring_data.get('scoring_factors', {})
-                    # scored_at has a default value in the model
-                )
-                db.add(lead_score)
+            lead_ids = []
+            for chunk in _chunked([(content_ids[url], lead_data) for url, lead_data in zip(source_urls, leads)]):
+                try:
+                    with db.begin_nested():
+                        lead_ids.extend(self._insert_lead_chunk(db, chunk))
+                except Exception as e:
+                    logger.warning(f"Bulk insert of {len(chunk)} leads failed, retrying one lead at a time: {e}")
+                    for content_id, lead_data in chunk:
+                        try:
+                            with db.begin_nested():
+                                lead_ids.extend(self._insert_lead_chunk(db, [(content_id, lead_data)]))
+                        except Exception as e:
+                            logger.error(
+                                f"Failed to store lead {lead_data.get('business_name')!r} "
+                                f"from {lead_data.get('source_url')}: {e}"
+                            )
             
-            db.commit()
-            logger.info(f"Successfully stored lead {lead.id} in database")
-            return lead.id
+            if savepoint is None:
+                db.commit()
+                # Only cache IDs we know are committed; the caller's transaction may still roll back
+                self._remember_content_ids(content_ids)
+            else:
+                savepoint.commit()
+            logger.info(f"Successfully stored {len(lead_ids)} leads in database")
+            return lead_ids
             
         except SQLAlchemyError as e:
-            db.rollback()
-            logger.error(f"Failed to store lead in database: {e}")
-            return None
+            (savepoint or db).rollback()
+            logger.error(f"Failed to bulk store leads in database: {e}")
+            return []
         except Exception as e:
-            db.rollback()
-            logger.error(f"Unexpected error storing lead: {e}")
-            return None
+            (savepoint or db).rollback()
+            logger.error(f"Unexpected error bulk storing leads: {e}")
+            return []
         finally:
-            db.close()
+            if session is None:
+                db.close()
     
-    def _get_or_create_crawled_content(self, db: Session, source_url: str) -> CrawledContent:
-        """Get existing crawled content or create new one"""
+    def _insert_lead_chunk(self, db: Session, chunk: List[Tuple[int, Dict[str, Any]]]) -> List[int]:
+        """Insert (content_id, lead_data) pairs and their scores, returning the lead IDs in order"""
+        lead_ids = self._insert_leads(db, [self._lead_row(content_id, lead_data) for content_id, lead_data in chunk])
+        score_rows = [
+            self._score_row(lead_id, lead_data['scoring'])
+            for lead_id, (_, lead_data) in zip(lead_ids, chunk) if lead_data.get('scoring')
+        ]
+        if score_rows:
+            db.execute(insert(LeadScore), score_rows)
+        return lead_ids
+    
+    def _insert_leads(self, db: Session, lead_rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert lead rows, returning their IDs in row order"""
+        if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            # One batched INSERT ... RETURNING (SQLite, PostgreSQL, MariaDB)
+            result = db.execute(
+                insert(ExtractedLead).returning(ExtractedLead.id, sort_by_parameter_order=True),
+                lead_rows,
+            )
+            return list(result.scalars())
+        # MySQL has no RETURNING; the unit of work reads each row's lastrowid
+        leads = [ExtractedLead(**row) for row in lead_rows]
+        db.add_all(leads)
+        db.flush()
+        return [lead.id for lead in leads]
+    
+    def _lead_row(self, content_id: int, lead_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'content_id': content_id,
+            'business_name': lead_data.get('business_name'),
+            'contact_person': lead_data.get('contact_person'),
+            'email': lead_data.get('email'),
+            'phone': lead_data.get('phone'),
+            'address': lead_data.get('address'),
+            'website': lead_data.get('website'),
+            'lead_type': lead_data.get('lead_type'),
+            'confidence_score': lead_data.get('confidence_score'),
+            'extraction_method': lead_data.get('extraction_method'),
+            # created_at has a default value in the model
+        }
+    
+    def _score_row(self, lead_id: int, scoring_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'lead_id': lead_id,
+            'completeness_score': scoring_data.get('completeness_score'),
+            'relevance_score': scoring_data.get('relevance_score'),
+            'freshness_score': scoring_data.get('freshness_score'),
+            'final_score': scoring_data.get('final_score'),
+            'scoring_factors': scoring_data.get('scoring_factors', {}),
+            # scored_at has a default value in the model
+        }
+    
+    def _normalize_source_url(self, source_url: Optional[str]) -> str:
         # Handle None or invalid source_url
         if not source_url or source_url == 'unknown' or source_url == 'None':
-            source_url = 'https://test.example.com/contact'  # Default URL for test leads
-        
-        # First, get or create the URL record
-        url_record = db.query(URLModel).filter_by(url=source_url).first()
-        if not url_record:
-            # Extract domain from URL
-            from urllib.parse import urlparse
-            try:
-                parsed = urlparse(source_url)
-                domain = parsed.netloc if parsed.netloc else 'unknown'
-            except Exception:
-                domain = 'unknown'
-            
-            url_record = URLModel(
-                url=source_url,
-                domain=domain,
-                discovered_from="lead_extraction",
-                search_query_id=None,  # No search query for manually added leads
-                crawl_status="completed"
-            )
-            db.add(url_record)
-            db.flush()
+            return 'https://test.example.com/contact'  # Default URL for test leads
+        return source_url
+    
+    def _cached_content_ids(self, source_urls: List[str]) -> Dict[str, int]:
+        with self._content_id_lock:
+            hits = {}
+            for url in source_urls:
+                content_id = self._content_id_cache.get(url)
+                if content_id is not None:
+                    self._content_id_cache.move_to_end(url)
+                    hits[url] = content_id
+            return hits
+    
+    def _remember_content_ids(self, content_ids: Dict[str, int]) -> None:
+        with self._content_id_lock:
+            for url, content_id in content_ids.items():
+                self._content_id_cache[url] = content_id
+                self._content_id_cache.move_to_end(url)
+            while len(self._content_id_cache) > CONTENT_ID_CACHE_SIZE:
+                self._content_id_cache.popitem(last=False)
+    
+    def _url_upsert(self, db: Session):
+        """INSERT into url that leaves existing rows (same url) untouched instead of failing"""
+        dialect = db.get_bind().dialect.name
+        if dialect in ('mysql', 'mariadb'):
+            stmt = mysql.insert(URLModel)
+            return stmt.on_duplicate_key_update(url=stmt.inserted.url)
+        if dialect == 'postgresql':
+            return postgresql.insert(URLModel).on_conflict_do_nothing(index_elements=['url'])
+        if dialect == 'sqlite':
+            return sqlite.insert(URLModel).on_conflict_do_nothing(index_elements=['url'])
+        return insert(URLModel).prefix_with('IGNORE')
+    
+    def _resolve_content_ids(self, db: Session, source_urls: List[str]) -> Dict[str, int]:
+        """Map each source URL to a crawled content ID, creating the URL and content rows that don't exist yet"""
+        # URL records: insert-or-ignore the whole batch against the unique url index, then one SELECT for the IDs
+        url_rows = [
+            {
+                'url': url,
+                'domain': urlparse(url).netloc or 'unknown',
+                'discovered_from': "lead_extraction",
+                'search_query_id': None,  # No search query for manually added leads
+                'crawl_status': "completed",
+            }
+            for url in source_urls
+        ]
+        url_upsert = self._url_upsert(db)
+        for chunk in _chunked(url_rows):
+            db.execute(url_upsert, chunk)
+        url_ids = dict(db.execute(select(URLModel.url, URLModel.id).where(URLModel.url.in_(source_urls))).all())
         
-        # Check if we already have crawled content for this URL
-        existing = db.query(CrawledContent).filter_by(url_id=url_record.id).first()
-        if existing:
-            return existing
+        # Crawled content: reuse the first existing record per URL, create the rest
+        content_by_url_id: Dict[int, int] = {}
+        for url_id, content_id in db.execute(
+            select(CrawledContent.url_id, CrawledContent.id)
+            .where(CrawledContent.url_id.in_(url_ids.values()))
+            .order_by(CrawledContent.id)
+        ):
+            content_by_url_id.setdefault(url_id, content_id)
+        missing = [url for url in source_urls if url_ids[url] not in content_by_url_id]
+        if missing:
+            content_rows = [
+                {
+                    'url_id': url_ids[url],
+                    'raw_html_path': "",  # We don't store HTML for leads
+                    'title': f"Content from {url}",
+                    'extracted_text': "",  # We don't store full content in DB for leads
+                    'processing_status': "completed",
+                }
+                for url in missing
+            ]
+            for chunk in _chunked(content_rows):
+                db.execute(insert(CrawledContent), chunk)
+            for url_id, content_id in db.execute(
+                select(CrawledContent.url_id, CrawledContent.id)
+                .where(CrawledContent.url_id.in_([url_ids[url] for url in missing]))
+                .order_by(CrawledContent.id)
+            ):
+                content_by_url_id.setdefault(url_id, content_id)
         
-        # Create new crawled content record
-        crawled_content = CrawledContent(
-            url_id=url_record.id,
-            raw_html_path="",  # We don't store HTML for leads
-            title=f"Content from {source_url}",
-            extracted_text="",  # We don't store full content in DB for leads
-            processing_status="completed"
-        )
-        db.add(crawled_content)
-        db.flush()
-        return crawled_content
+        return {url: content_by_url_id[url_ids[url]] for url in source_urls}
     
     def export_leads_to_csv(self, leads: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
         """Export leads to CSV file"""
@@ -140,41 +334,14 @@ class LeadStorageService:
         filepath = os.path.join(self.exports_dir, filename)
         
         try:
-            # Flatten the scoring data for CSV export
-            flattened_leads = []
-            for lead in leads:
-                flattened_lead = lead.copy()
-                
-                # Extract scoring data
-                if 'scoring' in lead and lead['scoring']:
-                    scoring = lead['scoring']
-                    flattened_lead.update({
-                        'completeness_score': scoring.get('completeness_score'),
-                        'relevance_score': scoring.get('relevance_score'),
-                        'freshness_score': scoring.get('freshness_score'),
-                        'final_score': scoring.get('final_score'),
-                        'scored_at': scoring.get('scored_at')
-                    })
-                
-                # Remove nested scoring object
-                flattened_lead.pop('scoring', None)
-                flattened_leads.append(flattened_lead)
-            
             # Write to CSV
-            if flattened_leads:
-                df = pd.DataFrame(flattened_leads)
-                df.to_csv(filepath, index=False, encoding='utf-8')
+            if leads:
+                self._leads_frame(leads).to_csv(filepath, index=False, encoding='utf-8')
                 logger.info(f"Exported {len(leads)} leads to CSV: {filepath}")
             else:
                 # Create empty CSV with headers
                 with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = [
-                        'business_name', 'contact_person', 'email', 'phone', 'address',
-                        'website', 'lead_type', 'confidence_score', 'extraction_method',
-                        'created_at', 'source_url', 'completeness_score', 'relevance_score',
-                        'freshness_score', 'final_score', 'scored_at'
-                    ]
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                    writer = csv.DictWriter(csvfile, fieldnames=EXPORT_FIELDNAMES)
                     writer.writeheader()
                 logger.info(f"Created empty CSV file: {filepath}")
             
@@ -184,6 +351,57 @@ class LeadStorageService:
             logger.error(f"Failed to export leads to CSV: {e}")
             raise
     
+    def _leads_frame(self, leads: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Leads as a DataFrame with the nested scoring dict spread into top-level columns
+        (same columns and order as _flatten_lead rows); other dict fields stay single cells"""
+        if not leads:
+            return pd.DataFrame()
+        df = pd.DataFrame(leads)
+        scoring = df.pop('scoring') if 'scoring' in df else None
+        if scoring is None or not any(lead.get('scoring') for lead in leads):
+            return df
+        scores = pd.DataFrame([s if isinstance(s, dict) else {} for s in scoring], columns=list(SCORING_EXPORT_FIELDS), index=df.index)
+        # First-seen key order of the flattened rows, as iter_leads_csv writes it
+        order = dict.fromkeys(
+            k for lead in leads
+            for k in ([*lead, *SCORING_EXPORT_FIELDS] if lead.get('scoring') else lead) if k != 'scoring'
+        )
+        return df.drop(columns=list(SCORING_EXPORT_FIELDS), errors='ignore').join(scores)[list(order)]
+    
+    def _flatten_lead(self, lead: Dict[str, Any]) -> Dict[str, Any]:
+        """Lead with the nested scoring dict spread into top-level columns, built in one pass"""
+        scoring = lead.get('scoring')
+        if not scoring:
+            return {k: v for k, v in lead.items() if k != 'scoring'}
+        return {
+            **{k: v for k, v in lead.items() if k != 'scoring'},
+            **{field: scoring.get(field) for field in SCORING_EXPORT_FIELDS},
+        }
+    
+    def iter_leads_csv(self, leads: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield a CSV export chunk by chunk (header first), without a temp file"""
+        flattened_leads = [self._flatten_lead(lead) for lead in leads]
+        # Same column set and order pandas would produce: union of keys, first-seen order
+        fieldnames = list(dict.fromkeys(k for lead in flattened_leads for k in lead)) or EXPORT_FIELDNAMES
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=fieldnames)
+        writer.writeheader()
+        for i, lead in enumerate(flattened_leads, 1):
+            writer.writerow(lead)
+            if i % 500 == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+    
+    def iter_leads_json(self, leads: List[Dict[str, Any]]) -> Iterator[bytes]:
+        """Yield a JSON array export one lead at a time"""
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        yield b"["
+        for i, lead in enumerate(leads):
+            yield (b",\n" if i else b"\n") + orjson.dumps(lead, default=str, option=option)
+        yield b"\n]\n"
+    
     def export_leads_to_excel(self, leads: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
         """Export leads to Excel file"""
         if not filename:
@@ -192,40 +410,14 @@ class LeadStorageService:
         filepath = os.path.join(self.exports_dir, filename)
         
         try:
-            # Flatten the scoring data for Excel export
-            flattened_leads = []
-            for lead in leads:
-                flattened_lead = lead.copy()
-                
-                # Extract scoring data
-                if 'scoring' in lead and lead['scoring']:
-                    scoring = lead['scoring']
-                    flattened_lead.update({
-                        'completeness_score': scoring.get('completeness_score'),
-                        'relevance_score': scoring.get('relevance_score'),
-                        'freshness_score': scoring.get('freshness_score'),
-                        'final_score': scoring.get('final_score'),
-                        'scored_at': scoring.get('scored_at')
-                    })
-                
-                # Remove nested scoring object
-                flattened_lead.pop('scoring', None)
-                flattened_leads.append(flattened_lead)
-            
             # Write to Excel
-            if flattened_leads:
-                df = pd.DataFrame(flattened_leads)
-                df.to_excel(filepath, index=False, engine='openpyxl')
+            if leads:
+                self._write_excel(self._leads_frame(leads), filepath)
                 logger.info(f"Exported {len(leads)} leads to Excel: {filepath}")
             else:
                 # Create empty Excel with headers
-                df = pd.DataFrame(columns=[
-                    'business_name', 'contact_person', 'email', 'phone', 'address',
-                    'website', 'lead_type', 'confidence_score', 'extraction_method',
-                    'created_at', 'source_url', 'completeness_score', 'relevance_score',
-                    'freshness_score', 'final_score', 'scored_at'
-                ])
-                df.to_excel(filepath, index=False, engine='openpyxl')
+                df = pd.DataFrame(columns=EXPORT_FIELDNAMES)
+                self._write_excel(df, filepath)
                 logger.info(f"Created empty Excel file: {filepath}")
             
             return filepath
@@ -234,6 +426,10 @@ class LeadStorageService:
             logger.error(f"Failed to export leads to Excel: {e}")
             raise
     
+    def _write_excel(self, df: pd.DataFrame, filepath: str) -> None:
+        # No constant_memory: it needs row-by-row writes, and to_excel fills the sheet column by column
+        df.to_excel(filepath, index=False, engine='xlsxwriter')
+    
     def export_leads_to_json(self, leads: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
         """Export leads to JSON file"""
         if not filename:
@@ -242,8 +438,12 @@ class LeadStorageService:
         filepath = os.path.join(self.exports_dir, filename)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(leads, f, ensure_ascii=False, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    leads,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                ))
             
             logger.info(f"Exported {len(leads)} leads to JSON: {filepath}")
             return filepath
@@ -252,11 +452,26 @@ class LeadStorageService:
             logger.error(f"Failed to export leads to JSON: {e}")
             raise
     
-    def get_leads_from_db(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    # Async variants for callers on an event loop: the pandas/file work runs in a worker thread
+    async def export_leads_to_csv_async(self, leads: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.export_leads_to_csv, leads, filename)
+    
+    async def export_leads_to_excel_async(self, leads: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.export_leads_to_excel, leads, filename)
+    
+    async def export_leads_to_json_async(self, leads: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.export_leads_to_json, leads, filename)
+    
+    def get_leads_from_db(self, limit: Optional[int] = None, offset: int = 0, *,
+                          session: Optional[Session] = None) -> List[Dict[str, Any]]:
         """Retrieve leads from database"""
-        db = SessionLocal()
+        db = session or SessionLocal()
         try:
-            query = db.query(ExtractedLead).offset(offset)
+            # Content and URL come in through joins, scores through one IN query; no per-lead lookups
+            query = db.query(ExtractedLead).options(
+                joinedload(ExtractedLead.crawled_content).joinedload(CrawledContent.url_record),
+                selectinload(ExtractedLead.lead_score),
+            ).offset(offset)
             if limit:
                 query = query.limit(limit)
             
@@ -265,24 +480,8 @@ class LeadStorageService:
             # Convert to dictionary format
             lead_dicts = []
             for lead in leads:
-                # Get the source URL from the URL table
-                source_url = None
-                try:
-                    if hasattr(lead, 'crawled_content') and lead.crawled_content and lead.crawled_content.url_id:
-                        url_record = db.query(URLModel).filter_by(id=lead.crawled_content.url_id).first()
-                        if url_record:
-                            source_url = url_record.url
-                except Exception as e:
-                    logger.warning(f"Could not get source URL for lead {lead.id}: {e}")
-                    # Fallback: try to get URL directly from content_id
-                    try:
-                        content = db.query(CrawledContent).filter_by(id=lead.content_id).first()
-                        if content and content.url_id:
-                            url_record = db.query(URLModel).filter_by(id=content.url_id).first()
-                            if url_record:
-                                source_url = url_record.url
-                    except Exception as e2:
-                        logger.warning(f"Fallback URL retrieval also failed for lead {lead.id}: {e2}")
+                content = lead.crawled_content
+                source_url = content.url_record.url if content is not None and content.url_record is not None else None
                 
                 lead_dict = {
                     'id': lead.id,
@@ -300,7 +499,7 @@ class LeadStorageService:
                 }
                 
                 # Add scoring data if available
-                lead_score = db.query(LeadScore).filter_by(lead_id=lead.id).first()
+                lead_score = lead.lead_score
                 if lead_score:
                     lead_dict['scoring'] = {
                         'completeness_score': lead_score.completeness_score,
@@ -319,11 +518,12 @@ class LeadStorageService:
             logger.error(f"Failed to retrieve leads from database: {e}")
             return []
         finally:
-            db.close()
+            if session is None:
+                db.close()
     
-    def get_lead_count_from_db(self) -> int:
+    def get_lead_count_from_db(self, *, session: Optional[Session] = None) -> int:
         """Get total number of leads in database"""
-        db = SessionLocal()
+        db = session or SessionLocal()
         try:
             count = db.query(ExtractedLead).count()
             return count
@@ -331,7 +531,8 @@ class LeadStorageService:
             logger.error(f"Failed to get lead count from database: {e}")
             return 0
         finally:
-            db.close()
+            if session is None:
+                db.close()
 
 # Global instance
 lead_storage = LeadStorageService() 
\ No newline at end of file
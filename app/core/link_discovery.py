@@ -1,14 +1,35 @@
-from bs4 import BeautifulSoup
+from lxml import etree
 from urllib.parse import urljoin, urlparse
+from functools import lru_cache
 from typing import List, Set, Optional
+import os
 import re
+import asyncio
+import httpx
 import requests
+from collections import deque
+from app.core.text_cleaner import parse_html_document
+
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 20))
+
+# All travel keywords in one case-insensitive scan instead of a substring test per keyword
+TRAVEL_LINK_RE = re.compile(r"hotel|resort|hostel|restaurant|tour|travel|blog|event|booking|trip", re.IGNORECASE)
+
+# Compiled once; sitemaps may or may not declare the sitemaps.org namespace, hence local-name()
+_HREF_XPATH = etree.XPath("//a/@href")
+_LOC_XPATH = etree.XPath('//*[local-name()="loc"]')
+_SITEMAP_PARSER = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
 
 def extract_links(html: str, base_url: str) -> List[str]:
-    soup = BeautifulSoup(html, "lxml")
+    if not html or not html.strip():
+        return []
+    try:
+        root = parse_html_document(html)
+    except (etree.ParserError, ValueError):
+        return []
     links = set()
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
+    for href in _HREF_XPATH(root):
+        href = href.strip()
         if href.startswith("#") or href.lower().startswith("javascript:"):
             continue
         full_url = urljoin(base_url, href)
@@ -16,44 +37,56 @@ def extract_links(html: str, base_url: str) -> List[str]:
     return list(links)
 
 def filter_travel_links(links: List[str]) -> List[str]:
-    travel_keywords = [
-        "hotel", "resort", "hostel", "restaurant", "tour", "travel", "blog", "event", "booking", "trip"
-    ]
-    filtered = [
-        link for link in links if any(kw in link.lower() for kw in travel_keywords)
-    ]
-    return filtered
+    return [link for link in links if TRAVEL_LINK_RE.search(link)]
 
 def parse_sitemap_xml(sitemap_url: str) -> List[str]:
     try:
         resp = requests.get(sitemap_url, timeout=10)
         if resp.status_code == 200:
-            soup = BeautifulSoup(resp.content, "xml")
-            return [loc.text for loc in soup.find_all("loc")]
+            root = etree.fromstring(resp.content, _SITEMAP_PARSER)
+            if root is None:
+                return []
+            return ["".join(loc.itertext()) for loc in _LOC_XPATH(root)]
     except Exception:
         pass
     return []
 
+@lru_cache(maxsize=10000)
+def _netloc(url: str) -> str:
+    return urlparse(url).netloc
+
 def is_same_domain(url1: str, url2: str) -> bool:
-    return urlparse(url1).netloc == urlparse(url2).netloc
+    return _netloc(url1) == _netloc(url2)
+
+async def _fetch_page(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str) -> Optional[str]:
+    async with sem:
+        resp = await client.get(url)
+    return resp.text if resp.status_code == 200 else None
 
-def depth_limited_crawl(start_url: str, html: str, max_depth: int = 2, domain_rule: Optional[str] = None) -> Set[str]:
+async def depth_limited_crawl(start_url: str, html: str, max_depth: int = 2, domain_rule: Optional[str] = None) -> Set[str]:
+    """Breadth-first crawl; each depth level's links are fetched concurrently over one pooled client"""
     visited = set([start_url])
-    to_visit = [(start_url, html, 0)]
+    to_visit = deque([(start_url, html, 0)])
     all_links = set()
-    while to_visit:
-        url, html_content, depth = to_visit.pop(0)
-        if depth >= max_depth:
-            continue
-        links = extract_links(html_content, url)
-        for link in links:
-            if link not in visited and (not domain_rule or domain_rule in link):
-                try:
-                    resp = requests.get(link, timeout=5)
-                    if resp.status_code == 200:
-                        to_visit.append((link, resp.text, depth + 1))
-                        all_links.add(link)
-                        visited.add(link)
-                except Exception:
-                    continue
-    return all_links 
\ No newline at end of file
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(timeout=5, follow_redirects=True,
+                                 limits=httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS)) as client:
+        while to_visit:
+            # Drain the whole level, collecting unvisited links from every page in it
+            depth = to_visit[0][2]
+            if depth >= max_depth:
+                break
+            new_links = {}
+            while to_visit and to_visit[0][2] == depth:
+                url, html_content, _ = to_visit.popleft()
+                for link in extract_links(html_content, url):
+                    if link not in visited and (not domain_rule or domain_rule in link):
+                        new_links.setdefault(link, None)
+            links = list(new_links)
+            pages = await asyncio.gather(*(_fetch_page(client, sem, link) for link in links), return_exceptions=True)
+            for link, page in zip(links, pages):
+                if isinstance(page, str):
+                    to_visit.append((link, page, depth + 1))
+                    all_links.add(link)
+                    visited.add(link)
+    return all_links
@@ -1,40 +1,81 @@
+import atexit
 import logging
-import json
+import logging.handlers
+import orjson
 import os
 import psutil
+import queue
+import threading
+from cachetools import TTLCache, cached
 from datetime import datetime
 from typing import Dict, Any
 
 LOGS_DIR = os.path.join("data", "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
 
+# log file path -> QueueHandler feeding that file's writer thread
+_queue_handlers: Dict[str, logging.handlers.QueueHandler] = {}
+_queue_handlers_lock = threading.Lock()
+
+def _queue_handler(log_file: str) -> logging.handlers.QueueHandler:
+    """Enqueue-only handler for log_file; one FileHandler + QueueListener thread per file does the writes"""
+    path = os.path.abspath(log_file)
+    with _queue_handlers_lock:
+        handler = _queue_handlers.get(path)
+        if handler is None:
+            file_handler = logging.FileHandler(path)
+            file_handler.setFormatter(logging.Formatter('%(message)s'))
+            log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+            listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+            listener.start()
+            # stop() drains the queue, so records logged just before exit still reach the file
+            atexit.register(listener.stop)
+            handler = _queue_handlers[path] = logging.handlers.QueueHandler(log_queue)
+        return handler
+
 # Structured JSON logger
 class JsonLogger:
     def __init__(self, name: str, log_file: str = None, log_level: int = logging.INFO):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
         if log_file:
-            handler = logging.FileHandler(log_file)
-            handler.setFormatter(logging.Formatter('%(message)s'))
-            self.logger.addHandler(handler)
+            # File I/O happens on a listener thread; log() only formats and enqueues
+            self.logger.addHandler(_queue_handler(log_file))
+
+    def is_enabled_for(self, level: str) -> bool:
+        return self.logger.isEnabledFor(getattr(logging, level.upper(), logging.INFO))
 
     def log(self, level: str, event: str, **kwargs):
+        numeric_level = getattr(logging, level.upper(), logging.INFO)
+        # Skip building and serializing the entry when the record would be dropped anyway
+        if not self.logger.isEnabledFor(numeric_level):
+            return
         entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": level,
             "event": event,
             **kwargs
         }
-        self.logger.log(getattr(logging, level.upper(), logging.INFO), json.dumps(entry, default=str))
+        self.logger.log(numeric_level, orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode())
 
 # System monitoring
 
+# Boot time is fixed for the life of the process
+_BOOT_TIME = datetime.fromtimestamp(psutil.boot_time())
+
+# statfs on / barely moves between polls
+@cached(TTLCache(maxsize=1, ttl=5.0), lock=threading.Lock())
+def _disk_percent() -> float:
+    return psutil.disk_usage('/').percent
+
+# psutil reads several /proc files per call; dashboards poll /metrics far more often than it changes
+@cached(TTLCache(maxsize=1, ttl=1.0), lock=threading.Lock())
 def get_system_metrics() -> Dict[str, Any]:
     return {
         "cpu_percent": psutil.cpu_percent(),
         "memory_percent": psutil.virtual_memory().percent,
-        "disk_percent": psutil.disk_usage('/').percent,
-        "uptime_seconds": (datetime.utcnow() - datetime.fromtimestamp(psutil.boot_time())).total_seconds(),
+        "disk_percent": _disk_percent(),
+        "uptime_seconds": (datetime.utcnow() - _BOOT_TIME).total_seconds(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
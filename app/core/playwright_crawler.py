@@ -2,10 +2,33 @@ import asyncio
 from typing import Dict, Any, Optional
 from playwright.async_api import async_playwright
 
-async def playwright_crawl(url: str, wait_selector: Optional[str] = None, scroll: bool = False) -> Dict[str, Any]:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+class PlaywrightCrawlerPool:
+    """One Chromium instance shared across crawls; each crawl gets its own throwaway BrowserContext"""
+    def __init__(self):
+        self._p = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._lock:
+            if self._browser is None:
+                self._p = await async_playwright().start()
+                self._browser = await self._p.chromium.launch(headless=True)
+
+    async def stop(self):
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._p is not None:
+                await self._p.stop()
+                self._p = None
+
+    async def crawl(self, url: str, wait_selector: Optional[str] = None, scroll: bool = False) -> Dict[str, Any]:
+        if self._browser is None:
+            await self.start()
+        ctx = await self._browser.new_context()
+        page = await ctx.new_page()
         try:
             response = await page.goto(url, timeout=20000)
             # Handle cookie dialogs (simple)
@@ -33,4 +56,9 @@ async def playwright_crawl(url: str, wait_selector: Optional[str] = None, scroll
                 "status": response.status if response else None,
             }
         finally:
-            await browser.close() 
\ No newline at end of file
+            await ctx.close()
+
+playwright_pool = PlaywrightCrawlerPool()
+
+async def playwright_crawl(url: str, wait_selector: Optional[str] = None, scroll: bool = False) -> Dict[str, Any]:
+    return await playwright_pool.crawl(url, wait_selector=wait_selector, scroll=scroll)
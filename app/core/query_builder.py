@@ -1,5 +1,18 @@
 from typing import List, Optional
 
+# Static query parts, built once at import rather than on every build_query call
+_TRAVEL_KEYWORDS = ("travel", "vacation", "journey", "holiday", "tour", "visit", "trip")
+_TARGET_GROUPS = (
+    "traveler", "adventurer", "tourist", "visitor",
+    "company", "corporate", "business", "group",
+    "travel influencer", "blogger", "vlogger", "content creator",
+    "tour operator", "bus operator", "travel agency",
+    "event organizer", "event planner",
+)
+_TRIP_TYPES = ("planning", "plan a trip", "plan a tour", "plan a holiday", "plan a visit")
+_DEFAULT_EXCLUDES = ("job", "career", "hiring", "free", "template", "sample")
+_EXCLUDE_STR = " ".join(f"-{word}" for word in _DEFAULT_EXCLUDES)
+
 def build_query(
     base: Optional[str] = None,
     location: Optional[str] = None,
@@ -27,27 +40,18 @@ def build_query(
     if location:
         parts.append(location)
     if add_travel_keywords:
-        parts.extend([
-            "travel", "vacation", "journey", "holiday", "tour", "visit", "trip"
-        ])
+        parts.extend(_TRAVEL_KEYWORDS)
     if add_target_groups:
-        parts.extend([
-            "traveler", "adventurer", "tourist", "visitor",
-            "company", "corporate", "business", "group",
-            "travel influencer", "blogger", "vlogger", "content creator",
-            "tour operator", "bus operator", "travel agency",
-            "event organizer", "event planner"
-        ])
+        parts.extend(_TARGET_GROUPS)
     if add_trip_types:
-        parts.extend([
-            "planning", "plan a trip", "plan a tour", "plan a holiday", "plan a visit"
-        ])
+        parts.extend(_TRIP_TYPES)
     if include:
         parts.extend(include)
     if extra:
         parts.extend(extra)
     if exclude is None:
-        exclude = ["job", "career", "hiring", "free", "template", "sample"]
-    exclude_str = " ".join([f"-{word}" for word in exclude])
+        exclude_str = _EXCLUDE_STR
+    else:
+        exclude_str = " ".join([f"-{word}" for word in exclude])
     query = " ".join(parts) + " " + exclude_str
     return query.strip() 
\ No newline at end of file
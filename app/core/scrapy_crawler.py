@@ -45,10 +45,10 @@ def run_scrapy_spider(urls: List[str]) -> List[Dict[str, Any]]:
     def collect_results(item, response, spider):
         results.append(item)
 
-    for url in urls:
-        crawler = process.create_crawler(TravelSpider)
-        crawler.signals.connect(collect_results, signal=signals.item_scraped)
-        process.crawl(crawler, start_urls=[url])
+    # One spider for every URL: a single engine/downloader schedules them under CONCURRENT_REQUESTS
+    crawler = process.create_crawler(TravelSpider)
+    crawler.signals.connect(collect_results, signal=signals.item_scraped)
+    process.crawl(crawler, start_urls=list(urls))
 
     process.start()
     return results 
\ No newline at end of file
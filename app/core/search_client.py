@@ -1,5 +1,6 @@
 import os
 import httpx
+import orjson
 import asyncio
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
@@ -9,15 +10,20 @@ load_dotenv()
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 GOOGLE_SEARCH_ENGINE_ID = os.getenv('GOOGLE_SEARCH_ENGINE_ID')
 MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', 5))
-CRAWL_DELAY_SECONDS = float(os.getenv('CRAWL_DELAY_SECONDS', 1))
 
 GOOGLE_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+SEARCH_CLIENT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
 
 class GoogleSearchClient:
     def __init__(self, api_key: Optional[str] = None, search_engine_id: Optional[str] = None):
         self.api_key = api_key or GOOGLE_API_KEY
         self.search_engine_id = search_engine_id or GOOGLE_SEARCH_ENGINE_ID
         self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # One keep-alive pool for every search, so only the first call pays the TLS handshake
+        self._client = httpx.AsyncClient(timeout=15, limits=SEARCH_CLIENT_LIMITS)
+
+    async def close(self):
+        await self._client.aclose()
 
     async def search(self, query: str, num: int = 10, start: int = 1, **kwargs) -> Dict[str, Any]:
         params = {
@@ -29,20 +35,19 @@ class GoogleSearchClient:
         }
         params.update(kwargs)
         async with self.semaphore:
-            async with httpx.AsyncClient(timeout=15) as client:
-                try:
-                    response = await client.get(GOOGLE_SEARCH_URL, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-                    # Optionally store raw response for debugging
-                    self._store_raw_response(query, data)
-                    return data
-                except httpx.HTTPStatusError as e:
-                    print(f"HTTP error: {e.response.status_code} - {e.response.text}")
-                    return {"error": str(e)}
-                except Exception as e:
-                    print(f"Request failed: {e}")
-                    return {"error": str(e)}
+            try:
+                response = await self._client.get(GOOGLE_SEARCH_URL, params=params)
+                response.raise_for_status()
+                data = response.json()
+                # Optionally store raw response for debugging (file write kept off the event loop)
+                await asyncio.to_thread(self._store_raw_response, query, data)
+                return data
+            except httpx.HTTPStatusError as e:
+                print(f"HTTP error: {e.response.status_code} - {e.response.text}")
+                return {"error": str(e)}
+            except Exception as e:
+                print(f"Request failed: {e}")
+                return {"error": str(e)}
 
     def _store_raw_response(self, query: str, data: Dict[str, Any]):
         # Store raw API response for debugging (optional, can be improved)
@@ -50,25 +55,20 @@ class GoogleSearchClient:
         safe_query = query.replace("/", "_").replace(" ", "_")[:50]
         filename = f"app/db/raw_search_responses/{safe_query}.json"
         try:
-            import json
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         except Exception as e:
             print(f"Failed to store raw response: {e}")
 
     async def paginated_search(self, query: str, max_results: int = 30) -> List[Dict[str, Any]]:
+        # All pages go out together (self.semaphore bounds them), then are stitched back in order
+        pages = [(start, min(10, max_results - start + 1)) for start in range(1, max_results + 1, 10)]
+        responses = await asyncio.gather(*(self.search(query, num=num, start=start) for start, num in pages))
         results = []
-        start = 1
-        while len(results) < max_results:
-            remaining = max_results - len(results)
-            num = min(10, remaining)
-            data = await self.search(query, num=num, start=start)
-            if "items" in data:
-                results.extend(data["items"])
-                if len(data["items"]) < num:
-                    break  # No more results
-            else:
+        for (_, num), data in zip(pages, responses):
+            if "items" not in data:
                 break  # Error or no items
-            start += num
-            await asyncio.sleep(CRAWL_DELAY_SECONDS)
-        return results 
\ No newline at end of file
+            results.extend(data["items"])
+            if len(data["items"]) < num:
+                break  # No more results
+        return results
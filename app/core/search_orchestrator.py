@@ -1,12 +1,21 @@
 import asyncio
-import heapq
 import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 from app.core.search_client import GoogleSearchClient
 from app.core.query_builder import build_query
-from app.core.search_result_processor import process_search_results
+from app.core.search_result_processor import process_search_results, dedup_streaming, UrlBloomFilter
+
+DEFAULT_JOB_CONCURRENCY = 5
+# (query, location, intent) keys remembered by SearchJobQueue for dedup, oldest evicted first
+SEEN_JOBS_LIMIT = 100_000
+# Sizing of the cross-job URL bloom filter (grows past this capacity, keeping the error rate)
+URL_BLOOM_CAPACITY = 1_000_000
+URL_BLOOM_ERROR_RATE = 1e-4
 
 class SearchJob:
+    __slots__ = ("query", "priority", "max_results", "intent", "location", "timestamp")
+
     def __init__(self, query: str, priority: int = 0, max_results: int = 30, intent: Optional[str] = None, location: Optional[str] = None):
         self.query = query
         self.priority = priority
@@ -21,26 +30,38 @@ class SearchJob:
 
 class SearchJobQueue:
     def __init__(self):
-        self._queue: List[Tuple[int, float, SearchJob]] = []
-        self._lock = asyncio.Lock()
+        # Heap of jobs themselves, ordered by SearchJob.__lt__; single-loop access needs no extra lock
+        self._queue: "asyncio.PriorityQueue[SearchJob]" = asyncio.PriorityQueue()
+        self._seen: "OrderedDict[Tuple[str, Optional[str], Optional[str]], None]" = OrderedDict()
 
-    async def add_job(self, job: SearchJob):
-        async with self._lock:
-            heapq.heappush(self._queue, (job.priority, job.timestamp, job))
+    async def add_job(self, job: SearchJob) -> bool:
+        """Enqueue job unless the same search was already submitted; returns whether it was queued"""
+        key = (job.query, job.location, job.intent)
+        if key in self._seen:
+            return False
+        self._seen[key] = None
+        if len(self._seen) > SEEN_JOBS_LIMIT:
+            self._seen.popitem(last=False)
+        self._queue.put_nowait(job)
+        return True
 
     async def get_next_job(self) -> Optional[SearchJob]:
-        async with self._lock:
-            if self._queue:
-                return heapq.heappop(self._queue)[2]
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
             return None
 
     def __len__(self):
-        return len(self._queue)
+        return self._queue.qsize()
 
 class SearchOrchestrator:
-    def __init__(self):
+    def __init__(self, concurrency: int = DEFAULT_JOB_CONCURRENCY):
         self.job_queue = SearchJobQueue()
         self.client = GoogleSearchClient()
+        # Jobs whose Google API calls may be in flight at once
+        self.concurrency = concurrency
+        # Per-job dedup is exact (process_search_results); across jobs an approximate filter keeps memory flat
+        self._url_bloom = UrlBloomFilter(initial_capacity=URL_BLOOM_CAPACITY, error_rate=URL_BLOOM_ERROR_RATE)
         self.metrics = {
             "total_jobs": 0,
             "total_results": 0,
@@ -51,39 +72,46 @@ class SearchOrchestrator:
 
     async def submit_search_job(self, query: str, priority: int = 0, max_results: int = 30, intent: Optional[str] = None, location: Optional[str] = None):
         job = SearchJob(query, priority, max_results, intent, location)
-        await self.job_queue.add_job(job)
-        self.metrics["total_jobs"] += 1
+        if await self.job_queue.add_job(job):
+            self.metrics["total_jobs"] += 1
 
-    async def run(self):
-        self.metrics["start_time"] = time.time()
-        while len(self.job_queue) > 0:
-            job = await self.job_queue.get_next_job()
-            if not job:
-                break
+    async def _run_job(self, job: SearchJob, sem: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        async with sem:
             # Build advanced query
             search_query = build_query(base=job.query, location=job.location)
             raw_results = await self.client.paginated_search(search_query, max_results=job.max_results)
-            self.metrics["total_results"] += len(raw_results)
-            processed = process_search_results(raw_results)
-            self.metrics["deduped_results"] += len(processed)
-            # Here you could store results to DB or return them
-            print(f"Job: {job.query} | Results: {len(processed)}")
+        processed = list(dedup_streaming(process_search_results(raw_results), self._url_bloom))
+        # No await between these updates, so concurrent jobs can't interleave them
+        self.metrics["total_results"] += len(raw_results)
+        self.metrics["deduped_results"] += len(processed)
+        print(f"Job: {job.query} | Results: {len(processed)}")
+        return processed
+
+    async def _run_queued_jobs(self) -> List[Dict[str, Any]]:
+        """Drain the queue in priority order, running each drained batch concurrently"""
+        all_results = []
+        sem = asyncio.Semaphore(self.concurrency)
+        while len(self.job_queue) > 0:
+            batch = []
+            while (job := await self.job_queue.get_next_job()) is not None:
+                batch.append(job)
+            outcomes = await asyncio.gather(*(self._run_job(job, sem) for job in batch), return_exceptions=True)
+            for job, outcome in zip(batch, outcomes):
+                if isinstance(outcome, BaseException):
+                    print(f"Job: {job.query} | Failed: {outcome}")
+                    continue
+                all_results.extend(outcome)
+        return all_results
+
+    async def run(self):
+        self.metrics["start_time"] = time.time()
+        await self._run_queued_jobs()
+        # Here you could store results to DB or return them
         self.metrics["end_time"] = time.time()
 
     async def run_and_return_results(self):
-        all_results = []
         self.metrics["start_time"] = time.time()
-        while len(self.job_queue) > 0:
-            job = await self.job_queue.get_next_job()
-            if not job:
-                break
-            search_query = build_query(base=job.query, location=job.location)
-            raw_results = await self.client.paginated_search(search_query, max_results=job.max_results)
-            self.metrics["total_results"] += len(raw_results)
-            processed = process_search_results(raw_results)
-            self.metrics["deduped_results"] += len(processed)
-            all_results.extend(processed)
-            print(f"Job: {job.query} | Results: {len(processed)}")
+        all_results = await self._run_queued_jobs()
         self.metrics["end_time"] = time.time()
         return all_results
 
@@ -1,6 +1,10 @@
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Iterable, Iterator, Set
+import hashlib
+import math
 import re
+from functools import lru_cache
 from app.core.monitoring import JsonLogger
+from app.core.content_classifier import keyword_regex, first_category
 import os
 import logging
 logger = JsonLogger("search_result_processor", os.path.join("data", "logs", "app.log"), log_level=logging.DEBUG)
@@ -15,13 +19,16 @@ CONTENT_TYPES = {
     "social": ["facebook", "instagram", "twitter", "linkedin"]
 }
 
+SPAM_DOMAINS = ["pinterest.com", "yelp.com", "tripadvisor.com", "reddit.com", "quora.com"]
+
+# Each keyword set scanned in one regex pass instead of a Python loop of substring tests
+_SPAM_DOMAIN_RE = re.compile("|".join(map(re.escape, SPAM_DOMAINS)))
+_CONTENT_TYPE_RE = keyword_regex(CONTENT_TYPES)
+
+@lru_cache(maxsize=131072)
 def filter_domain_quality(url: str) -> bool:
     # Simple filter: avoid spammy or irrelevant domains
-    spam_domains = ["pinterest.com", "yelp.com", "tripadvisor.com", "reddit.com", "quora.com"]
-    for spam in spam_domains:
-        if spam in url:
-            return False
-    return True
+    return _SPAM_DOMAIN_RE.search(url) is None
 
 def deduplicate_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     seen: Set[str] = set()
@@ -33,27 +40,89 @@ def deduplicate_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             deduped.append(item)
     return deduped
 
+class UrlBloomFilter:
+    """Approximate seen-URL set for cross-job dedup: ~2.4 bytes per URL at 1e-4 false positives.
+
+    Grows by chaining a new filter (twice the capacity, half the error rate) whenever the
+    current one fills up, so the overall false-positive rate stays under error_rate.
+    """
+    def __init__(self, initial_capacity: int = 1_000_000, error_rate: float = 1e-4):
+        self._capacity = initial_capacity
+        self._error_rate = error_rate / 2
+        self._layers: List[Dict[str, Any]] = []
+        self._add_layer()
+
+    def _add_layer(self):
+        capacity = self._capacity * (2 ** len(self._layers))
+        error_rate = self._error_rate / (2 ** len(self._layers))
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self._layers.append({
+            "bits": bytearray((bits + 7) // 8),
+            "size": bits,
+            "hashes": max(1, round(bits / capacity * math.log(2))),
+            "capacity": capacity,
+            "count": 0,
+        })
+
+    @staticmethod
+    def _positions(url: str, layer: Dict[str, Any]) -> Iterator[int]:
+        # Kirsch-Mitzenmacher double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = layer["size"]
+        for i in range(layer["hashes"]):
+            yield (h1 + i * h2) % size
+
+    def __contains__(self, url: str) -> bool:
+        for layer in self._layers:
+            bits = layer["bits"]
+            if all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url, layer)):
+                return True
+        return False
+
+    def add(self, url: str):
+        layer = self._layers[-1]
+        if layer["count"] >= layer["capacity"]:
+            self._add_layer()
+            layer = self._layers[-1]
+        bits = layer["bits"]
+        for pos in self._positions(url, layer):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        layer["count"] += 1
+
+def dedup_streaming(results: Iterable[Dict[str, Any]], bloom: UrlBloomFilter) -> Iterator[Dict[str, Any]]:
+    """Yield items whose url the bloom filter hasn't seen; a false positive drops a new URL, never keeps a duplicate"""
+    for item in results:
+        url = item.get("url")
+        if url and url not in bloom:
+            bloom.add(url)
+            yield item
+
+@lru_cache(maxsize=65536)
 def categorize_result(url: str, title: str = "") -> str:
-    for ctype, keywords in CONTENT_TYPES.items():
-        for kw in keywords:
-            if kw in url.lower() or kw in title.lower():
-                return ctype
-    return "other"
+    # URL and title in one buffer, lowercased in a single pass; no keyword can match across the NUL separator
+    return first_category(_CONTENT_TYPE_RE, f"{url}\0{title}".lower()) or "other"
 
 def process_search_results(raw_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     processed = []
+    # Checked once per batch so the per-URL debug events cost nothing when debug logging is off
+    debug = logger.is_enabled_for("debug")
     for item in raw_results:
         url = item.get("link")
         title = item.get("title", "")
         description = item.get("snippet", "")
         if not url:
-            logger.log("debug", "process_search_results_skip", reason="missing_url")
+            if debug:
+                logger.log("debug", "process_search_results_skip", reason="missing_url")
             continue
         if not filter_domain_quality(url):
-            logger.log("debug", "process_search_results_filtered", reason="domain_quality", url=url)
+            if debug:
+                logger.log("debug", "process_search_results_filtered", reason="domain_quality", url=url)
             continue
         category = categorize_result(url, title)
-        logger.log("debug", "process_search_results_accepted", url=url, category=category)
+        if debug:
+            logger.log("debug", "process_search_results_accepted", url=url, category=category)
         processed.append({
             "url": url,
             "title": title,
@@ -66,4 +135,4 @@ def process_search_results(raw_results: List[Dict[str, Any]]) -> List[Dict[str,
             }
         })
     logger.log("debug", "process_search_results_summary", total_accepted=len(processed), total_input=len(raw_results))
-    return deduplicate_results(processed) 
\ No newline at end of file
+    return deduplicate_results(processed)
\ No newline at end of file
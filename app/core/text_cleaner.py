@@ -1,41 +1,92 @@
 import re
-import nltk
-from bs4 import BeautifulSoup
+import threading
+from lxml import etree, html as lxml_html
 from typing import Optional
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-from nltk.corpus import stopwords
-from nltk import word_tokenize
+# NLTK's English stopword list, inlined so importing this module doesn't load (or download) NLTK corpora
+EN_STOPWORDS = frozenset((
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've",
+    "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself',
+    'she', "she's", 'her', 'hers', 'herself', 'it', "it's", 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that', "that'll",
+    'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has',
+    'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or',
+    'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against',
+    'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from',
+    'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once',
+    'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
+    'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 's', 't', 'can', 'will', 'just', 'don', "don't", 'should', "should've", 'now',
+    'd', 'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren', "aren't", 'couldn', "couldn't", 'didn',
+    "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn',
+    "isn't", 'ma', 'mightn', "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't",
+    'shouldn', "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't", 'wouldn',
+    "wouldn't",
+))
+# Lowercase words, keeping contractions ("don't") whole so they can hit the list
+WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
 
-EN_STOPWORDS = set(stopwords.words('english'))
+WHITESPACE_RE = re.compile(r"\s+")
+# str.translate deletion table for zero-width characters
+ZERO_WIDTH_TABLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff"))
+# A line is boilerplate only if it is exactly one of these (case-insensitive)
+BOILERPLATE_RE = re.compile(r"(?:copyright|all rights reserved|privacy policy|terms of service|footer|header)$", re.I)
+BLOCK_SPLIT_RE = re.compile(r"\n{2,}")
+
+NON_CONTENT_TAGS = ("script", "style", "noscript", "iframe")
+
+# Parsers are reused across pages, one set per thread (lxml parsers shouldn't be shared across threads)
+_parser_local = threading.local()
+
+def _html_parser(remove_blank_text: bool = False, encoding: Optional[str] = None) -> lxml_html.HTMLParser:
+    key = (remove_blank_text, encoding)
+    parsers = getattr(_parser_local, "parsers", None)
+    if parsers is None:
+        parsers = _parser_local.parsers = {}
+    parser = parsers.get(key)
+    if parser is None:
+        parser = parsers[key] = lxml_html.HTMLParser(remove_blank_text=remove_blank_text, encoding=encoding)
+    return parser
+
+def parse_html_document(html: str, remove_blank_text: bool = False):
+    """lxml document for an HTML string; raises etree.ParserError/ValueError if it can't be parsed"""
+    try:
+        return lxml_html.document_fromstring(html, parser=_html_parser(remove_blank_text))
+    except ValueError:
+        # lxml rejects str input that opens with an XML encoding declaration (common on XHTML
+        # pages); the text is already decoded, so parse it as UTF-8 bytes instead
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=_html_parser(remove_blank_text, "utf-8"))
 
 def clean_html(raw_html: str) -> str:
     # Remove HTML tags and JavaScript
-    soup = BeautifulSoup(raw_html, "lxml")
-    for tag in soup(["script", "style", "noscript", "iframe"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
-    return text
+    if not raw_html or not raw_html.strip():
+        return ""
+    try:
+        # Whitespace-only text nodes are dropped by libxml2 while parsing
+        root = parse_html_document(raw_html, remove_blank_text=True)
+    except (etree.ParserError, ValueError):
+        return ""
+    # Empty the non-content tags in place; unlike strip_elements this keeps the text on either
+    # side as separate strings, as decompose() did. itertext() already skips comments
+    for el in list(root.iter(*NON_CONTENT_TAGS)):
+        el.clear(keep_tail=True)
+    # Same as BeautifulSoup's get_text(separator=" ", strip=True)
+    return " ".join(t.strip() for t in root.itertext() if t.strip())
 
 def clean_whitespace(text: str) -> str:
     # Remove excessive whitespace and special characters
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"[\r\n\t]+", " ", text)
-    text = re.sub(r"[\u200b\u200c\u200d\ufeff]", "", text)
-    return text.strip()
+    return WHITESPACE_RE.sub(" ", text).translate(ZERO_WIDTH_TABLE).strip()
 
 def detect_language(text: str) -> Optional[str]:
-    # Simple language detection using stopwords
-    tokens = set(word_tokenize(text.lower()))
-    if len(tokens & EN_STOPWORDS) > 3:
-        return "en"
+    # Simple language detection using stopwords: more than 3 distinct ones means English.
+    # Scans lazily and stops at the 4th, instead of tokenizing the whole text
+    seen = set()
+    for match in WORD_RE.finditer(text.lower()):
+        word = match.group()
+        if word in EN_STOPWORDS:
+            seen.add(word)
+            if len(seen) > 3:
+                return "en"
     return None
 
 def normalize_encoding(text: str) -> str:
@@ -46,24 +97,11 @@ def normalize_encoding(text: str) -> str:
 
 def remove_boilerplate(text: str) -> str:
     # Remove common boilerplate (headers, footers) only if the whole line matches
-    boilerplate_patterns = [
-        r"^copyright$",
-        r"^all rights reserved$",
-        r"^privacy policy$",
-        r"^terms of service$",
-        r"^footer$",
-        r"^header$"
-    ]
-    lines = text.splitlines()
-    cleaned_lines = []
-    for l in lines:
-        if not any(re.search(pat, l.strip(), re.I) for pat in boilerplate_patterns):
-            cleaned_lines.append(l)
-    return " ".join(cleaned_lines)
+    return " ".join(l for l in text.splitlines() if not BOILERPLATE_RE.match(l.strip()))
 
 def extract_main_content(text: str) -> str:
     # Heuristic: return the largest paragraph or block
-    blocks = re.split(r"\n{2,}", text)
+    blocks = BLOCK_SPLIT_RE.split(text)
     if not blocks:
         return text
     return max(blocks, key=len)
@@ -71,8 +109,9 @@ def extract_main_content(text: str) -> str:
 def process_text_pipeline(raw_html: str) -> dict:
     text = clean_html(raw_html)
     text = clean_whitespace(text)
-    text = remove_boilerplate(text)
-    main_content = extract_main_content(text)
+    # clean_whitespace leaves no line breaks, so remove_boilerplate + extract_main_content
+    # reduce to one whole-text check; skip their split/join passes over the buffer
+    main_content = "" if BOILERPLATE_RE.match(text) else text
     lang = detect_language(main_content)
     main_content = normalize_encoding(main_content)
     return {
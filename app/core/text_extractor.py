@@ -1,10 +1,62 @@
 import re
+import hashlib
+import threading
+from cachetools import LRUCache, cached
+from functools import lru_cache
+from lxml import etree
 from newspaper import Article
-from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
-import json
-import requests
+from typing import Dict, Any, Optional, List, Iterator
+import orjson
+import asyncio
+import concurrent.futures
+import httpx
+from app.core.text_cleaner import parse_html_document
 
+EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+# Obfuscated emails (e.g., info [at] example [dot] com)
+OBFUSCATED_EMAIL_RE = re.compile(r"([a-zA-Z0-9_.+-]+)\s*\[at\]\s*([a-zA-Z0-9-]+)\s*\[dot\]\s*([a-zA-Z0-9-.]+)", re.IGNORECASE)
+# Numbers and addresses only start at the beginning of a digit run, and the address's free-text
+# runs are capped, so a long page can't make these backtrack from every position
+PHONE_RE = re.compile(r"(?<!\d)\+?\d[\d\s().-]{7,}\d")
+# Obfuscated phones (e.g., +91 [space] 12345 [space] 67890)
+OBFUSCATED_PHONE_RE = re.compile(r"\+?\d{1,3}\s*\[space\]\s*\d{3,5}\s*\[space\]\s*\d{3,5}")
+# Very basic US/India style street address
+ADDRESS_RE = re.compile(r"(?<!\d)\d{1,5} [\w .,-]{1,100},? [\w .,-]{1,100},? [A-Z]{2,} ?\d{3,6}")
+SOCIAL_DOMAINS = [
+    "facebook.com", "instagram.com", "twitter.com", "linkedin.com",
+    "youtube.com", "t.me", "telegram.me", "wa.me", "whatsapp.com"
+]
+SOCIAL_DOMAIN_RE = re.compile("|".join(map(re.escape, SOCIAL_DOMAINS)))
+
+def _bytes_pattern(rx: "re.Pattern") -> "re.Pattern[bytes]":
+    # Same pattern for raw response bodies; classes like \d and \s become ASCII-only
+    return re.compile(rx.pattern.encode("ascii"), rx.flags & ~re.UNICODE)
+
+# Contact pages are scanned straight from the response bytes; only the hits get decoded
+EMAIL_RE_B = _bytes_pattern(EMAIL_RE)
+OBFUSCATED_EMAIL_RE_B = _bytes_pattern(OBFUSCATED_EMAIL_RE)
+PHONE_RE_B = _bytes_pattern(PHONE_RE)
+OBFUSCATED_PHONE_RE_B = _bytes_pattern(OBFUSCATED_PHONE_RE)
+
+# Contact pages fetched at once by fetch_and_extract_contact_info
+CONTACT_FETCH_CONCURRENCY = 10
+
+JOB_TITLE_RE = re.compile(r"\b(CEO|Founder|Owner|Manager|Director|President|Principal|Partner|Head|Lead|Chairman|Chief [A-Za-z ]+|[A-Za-z]+ Officer)\b", re.IGNORECASE)
+
+# Compiled once; run against the document cached by _parse_html
+_HREF_XPATH = etree.XPath("//a/@href")
+_LINK_XPATH = etree.XPath("//a[@href]")
+_JSONLD_XPATH = etree.XPath('//script[@type="application/ld+json"]')
+_TITLE_XPATH = etree.XPath("(//title)[1]")
+_OG_SITE_NAME_XPATH = etree.XPath('(//meta[@property="og:site_name"])[1]/@content')
+
+def _article_key(url: str, html: Optional[str] = None):
+    # Digest rather than the page itself, so cached keys don't pin whole HTML documents
+    return url, hashlib.blake2b((html or "").encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+# The same page shows up across overlapping search jobs; newspaper's parse is the expensive part.
+# Cached results are shared between callers, so treat them as read-only
+@cached(LRUCache(maxsize=1024), key=_article_key, lock=threading.Lock())
 def extract_article_content(url: str, html: Optional[str] = None) -> Dict[str, Any]:
     article = Article(url)
     if html:
@@ -25,41 +77,69 @@ def extract_article_content(url: str, html: Optional[str] = None) -> Dict[str, A
 
 def extract_emails(text: str) -> List[str]:
     # Standard email
-    emails = set(re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text))
-    # Obfuscated emails (e.g., info [at] example [dot] com)
-    obfuscated = re.findall(r"([a-zA-Z0-9_.+-]+)\s*\[at\]\s*([a-zA-Z0-9-]+)\s*\[dot\]\s*([a-zA-Z0-9-.]+)", text, re.IGNORECASE)
+    emails = set(EMAIL_RE.findall(text))
+    # Obfuscated emails
+    obfuscated = OBFUSCATED_EMAIL_RE.findall(text)
     for parts in obfuscated:
         emails.add(f"{parts[0]}@{parts[1]}.{parts[2]}")
     return list(emails)
 
 def extract_phones(text: str) -> List[str]:
     # Standard phone numbers
-    phones = set(re.findall(r"\+?\d[\d\s().-]{7,}\d", text))
-    # Obfuscated phones (e.g., +91 [space] 12345 [space] 67890)
-    obfuscated = re.findall(r"\+?\d{1,3}\s*\[space\]\s*\d{3,5}\s*\[space\]\s*\d{3,5}", text)
+    phones = set(PHONE_RE.findall(text))
+    # Obfuscated phones
+    obfuscated = OBFUSCATED_PHONE_RE.findall(text)
     for phone in obfuscated:
         phones.add(phone.replace("[space]", " ").replace(" ", ""))
     return list(phones)
 
+def extract_emails_bytes(html: bytes) -> List[str]:
+    """extract_emails for an undecoded body (every match is ASCII)"""
+    emails = {m.decode("ascii") for m in EMAIL_RE_B.findall(html)}
+    for parts in OBFUSCATED_EMAIL_RE_B.findall(html):
+        emails.add((b"%s@%s.%s" % parts).decode("ascii"))
+    return list(emails)
+
+def extract_phones_bytes(html: bytes) -> List[str]:
+    """extract_phones for an undecoded body (every match is ASCII)"""
+    phones = {m.decode("ascii") for m in PHONE_RE_B.findall(html)}
+    for phone in OBFUSCATED_PHONE_RE_B.findall(html):
+        phones.add(phone.replace(b"[space]", b" ").replace(b" ", b"").decode("ascii"))
+    return list(phones)
+
+@lru_cache(maxsize=8)
+def _parse_html(html: str):
+    """Parsed document for html, shared by the extractors below (read-only; don't mutate it)"""
+    if not html or not html.strip():
+        return None
+    try:
+        return parse_html_document(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+def _jsonld_dicts(root) -> Iterator[Dict[str, Any]]:
+    for script in _JSONLD_XPATH(root):
+        try:
+            data = orjson.loads(script.text)
+        except (orjson.JSONDecodeError, TypeError):
+            continue
+        if isinstance(data, dict):
+            yield data
+
 def extract_social_links(html: str) -> List[str]:
-    soup = BeautifulSoup(html, "lxml")
-    social_domains = [
-        "facebook.com", "instagram.com", "twitter.com", "linkedin.com",
-        "youtube.com", "t.me", "telegram.me", "wa.me", "whatsapp.com"
-    ]
-    links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if any(domain in href for domain in social_domains):
-            links.append(href)
-    return list(set(links))
+    root = _parse_html(html)
+    if root is None:
+        return []
+    return list({href for href in _HREF_XPATH(root) if SOCIAL_DOMAIN_RE.search(href)})
 
 def extract_contact_page_links(html: str, base_url: str = "") -> List[str]:
-    soup = BeautifulSoup(html, "lxml")
+    root = _parse_html(html)
+    if root is None:
+        return []
     contact_links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"].lower()
-        text = a.get_text().lower()
+    for a in _LINK_XPATH(root):
+        href = a.get("href").lower()
+        text = "".join(a.itertext()).lower()
         if "contact" in href or "contact" in text:
             link = href
             if base_url and not link.startswith("http") and not link.startswith("/"):
@@ -70,68 +150,76 @@ def extract_contact_page_links(html: str, base_url: str = "") -> List[str]:
 def extract_physical_addresses(html: str) -> List[str]:
     # Try to extract schema.org address
     addresses = []
-    soup = BeautifulSoup(html, "lxml")
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string)
-            if isinstance(data, dict):
-                if data.get("@type") in ["Organization", "LocalBusiness", "Place", "Hotel"] and "address" in data:
-                    addr = data["address"]
-                    if isinstance(addr, dict):
-                        address_str = ", ".join([str(addr.get(k, "")) for k in ["streetAddress", "addressLocality", "addressRegion", "postalCode", "addressCountry"] if addr.get(k)])
-                        if address_str:
-                            addresses.append(address_str)
-                    elif isinstance(addr, str):
-                        addresses.append(addr)
-        except Exception:
-            continue
+    root = _parse_html(html)
+    for data in (_jsonld_dicts(root) if root is not None else ()):
+        if data.get("@type") in ["Organization", "LocalBusiness", "Place", "Hotel"] and "address" in data:
+            addr = data["address"]
+            if isinstance(addr, dict):
+                address_str = ", ".join([str(addr.get(k, "")) for k in ["streetAddress", "addressLocality", "addressRegion", "postalCode", "addressCountry"] if addr.get(k)])
+                if address_str:
+                    addresses.append(address_str)
+            elif isinstance(addr, str):
+                addresses.append(addr)
     # Fallback: regex for addresses (very basic, US/India style)
-    regex = r"\d{1,5} [\w .,-]+,? [\w .,-]+,? [A-Z]{2,} ?\d{3,6}"
-    addresses += re.findall(regex, html)
+    addresses += ADDRESS_RE.findall(html)
     return list(set(addresses))
 
 def extract_organization_name(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "lxml")
+    root = _parse_html(html)
+    if root is None:
+        return None
     # Try schema.org
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(script.string)
-            if isinstance(data, dict):
-                if data.get("@type") in ["Organization", "LocalBusiness", "Place", "Hotel"] and "name" in data:
-                    return data["name"]
-        except Exception:
-            continue
+    for data in _jsonld_dicts(root):
+        if data.get("@type") in ["Organization", "LocalBusiness", "Place", "Hotel"] and "name" in data:
+            return data["name"]
     # Fallback: title tag
-    if soup.title and soup.title.string:
-        return soup.title.string.strip()
+    title = _TITLE_XPATH(root)
+    if title and title[0].text:
+        return title[0].text.strip()
     # Fallback: meta og:site_name
-    meta = soup.find("meta", property="og:site_name")
-    if meta and meta.get("content"):
-        return meta["content"].strip()
+    site_name = _OG_SITE_NAME_XPATH(root)
+    if site_name and site_name[0]:
+        return site_name[0].strip()
     return None
 
 def extract_job_titles(text: str) -> List[str]:
     # Simple regex for common job titles
-    titles = re.findall(r"\b(CEO|Founder|Owner|Manager|Director|President|Principal|Partner|Head|Lead|Chairman|Chief [A-Za-z ]+|[A-Za-z]+ Officer)\b", text, re.IGNORECASE)
+    titles = JOB_TITLE_RE.findall(text)
     return list(set([t.strip() for t in titles]))
 
-def fetch_and_extract_contact_info(base_url: str, contact_links: List[str]) -> Dict[str, List[str]]:
+def _contact_url(base_url: str, link: str) -> str:
+    # Normalize link
+    if link.startswith("/"):
+        return base_url.rstrip("/") + link
+    if link.startswith("http"):
+        return link
+    return base_url.rstrip("/") + "/" + link.lstrip("/")
+
+async def fetch_and_extract_contact_info_async(base_url: str, contact_links: List[str]) -> Dict[str, List[str]]:
+    """Fetch the contact pages concurrently over one client (at most CONTACT_FETCH_CONCURRENCY
+    in flight) and collect their emails and phones"""
     emails = set()
     phones = set()
-    for link in contact_links:
-        # Normalize link
-        if link.startswith("/"):
-            url = base_url.rstrip("/") + link
-        elif link.startswith("http"):
-            url = link
-        else:
-            url = base_url.rstrip("/") + "/" + link.lstrip("/")
-        try:
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 200:
-                html = resp.text
-                emails.update(extract_emails(html))
-                phones.update(extract_phones(html))
-        except Exception:
-            continue
-    return {"emails": list(emails), "phones": list(phones)} 
\ No newline at end of file
+    sem = asyncio.Semaphore(CONTACT_FETCH_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
+        async def fetch(link: str) -> httpx.Response:
+            async with sem:
+                return await client.get(_contact_url(base_url, link))
+        responses = await asyncio.gather(*(fetch(link) for link in contact_links), return_exceptions=True)
+    for resp in responses:
+        if isinstance(resp, httpx.Response) and resp.status_code == 200:
+            body = resp.content
+            emails.update(extract_emails_bytes(body))
+            phones.update(extract_phones_bytes(body))
+    return {"emails": list(emails), "phones": list(phones)}
+
+def fetch_and_extract_contact_info(base_url: str, contact_links: List[str]) -> Dict[str, List[str]]:
+    coro = fetch_and_extract_contact_info_async(base_url, contact_links)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Called from code running on an event loop (a FastAPI handler, BG_LOOP): asyncio.run
+    # can't nest, so run the fetch on its own loop in a fresh thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
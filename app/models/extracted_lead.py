@@ -8,7 +8,7 @@ class ExtractedLead(Base):
     content_id = Column(Integer, ForeignKey('crawled_content.id'), nullable=False)
     business_name = Column(String(255))
     contact_person = Column(String(255))
-    email = Column(String(255), index=True)
+    email = Column(String(255))
     phone = Column(String(32))
     address = Column(Text)
     website = Column(String(255))
@@ -18,4 +18,5 @@ class ExtractedLead(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
-    crawled_content = relationship("CrawledContent", back_populates="leads") 
\ No newline at end of file
+    crawled_content = relationship("CrawledContent", back_populates="leads")
+    lead_score = relationship("LeadScore", uselist=False, back_populates="lead") 
\ No newline at end of file
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, JSON
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -10,4 +11,7 @@ class LeadScore(Base):
     freshness_score = Column(Float)
     final_score = Column(Float)
     scoring_factors = Column(JSON)
-    scored_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False) 
\ No newline at end of file
+    scored_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    # Relationships
+    lead = relationship("ExtractedLead", back_populates="lead_score")
@@ -1,17 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
 
 class URLModel(Base):
     __tablename__ = 'url'
+    # Scheduler lookups filter on status, then domain ("pending URLs for example.com")
+    __table_args__ = (Index('ix_url_status_domain', 'crawl_status', 'domain'),)
     url = Column(String(255), unique=True, nullable=False)
     domain = Column(String(255), index=True, nullable=False)
     discovered_from = Column(String(255), nullable=False)
     search_query_id = Column(Integer, ForeignKey('search_query.id'), nullable=True)
     first_seen = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_crawled = Column(DateTime(timezone=True))
-    crawl_status = Column(String(32), index=True, default='pending')
+    crawl_status = Column(String(32), default='pending')
     http_status_code = Column(Integer)
     content_type = Column(String(64))
     content_length = Column(Integer)
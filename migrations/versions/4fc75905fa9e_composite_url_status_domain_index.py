@@ -0,0 +1,32 @@
+"""Composite url (crawl_status, domain) index; drop unused single-column indexes
+
+Revision ID: 4fc75905fa9e
+Revises: 3f66284b162f
+Create Date: 2026-10-15 06:55:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4fc75905fa9e'
+down_revision: Union[str, Sequence[str], None] = '3f66284b162f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_url_status_domain', 'url', ['crawl_status', 'domain'], unique=False)
+    op.drop_index(op.f('ix_url_crawl_status'), table_name='url')
+    op.drop_index(op.f('ix_extracted_lead_email'), table_name='extracted_lead')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_extracted_lead_email'), 'extracted_lead', ['email'], unique=False)
+    op.create_index(op.f('ix_url_crawl_status'), 'url', ['crawl_status'], unique=False)
+    op.drop_index('ix_url_status_domain', table_name='url')
@@ -10,20 +10,20 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.db.base import Base
 from app.db.session import engine
+from sqlalchemy import text
 
 def setup_database():
     """Create all database tables"""
     print("🔧 Setting up database tables...")
     
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Test connection and create all tables over one connection
+        with engine.begin() as conn:
+            conn.execute(text("SELECT 1"))
+            print("✅ Database connection successful!")
+            Base.metadata.create_all(bind=conn)
         print("✅ All database tables created successfully!")
         
-        # Test connection
-        from app.db.session import test_db_connection
-        test_db_connection()
-        
         print("✅ Database setup completed!")
         return True
         